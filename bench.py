@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks for gs2jira.py
+"""
+
+import io, os, sys, csv, json, time, argparse, subprocess, statistics, tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(HERE, 'gs2jira.py')
+
+# Placeholder settings so offline commands can load a valid configuration
+BENCH_ENV = {
+    'SHEET_NAME': 'bench',
+    'ITEM_NAME': 'C',
+    'TOOL_OWNER': 'G',
+    'DATA_OWNER': 'H',
+    'PRIMARY_SHEET': '1',
+    'DATA_RANGE': '7:168',
+    'SECONDARY_SHEET': '7',
+    'OWNER_ID': 'B',
+    'TABLE_FLAG_COLUMNS': 'AA,AE,AG,AI,AK,AM,AP,AR,AT,AV,AX,AZ,BB',
+    'JIRA_SERVER_URL': 'https://example.atlassian.net',
+    'JIRA_USERNAME': 'bench',
+    'JIRA_OAUTH_TOKEN': 'bench',
+    'JIRA_PROJECT_KEY': 'BENCH',
+    'JIRA_EPIC_KEY': 'BENCH-1',
+    'DOC_URL': 'https://docs.example.com/bench',
+}
+
+def timed_run(argv, repeat):
+    """
+    Return the wall times in seconds of running argv `repeat` times
+    """
+    env = dict(os.environ, **BENCH_ENV)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        times.append(time.perf_counter() - start)
+    return times
+
+def bench_imports(args):
+    """
+    Measure start-up time of the offline commands and check the backends stay unloaded
+    """
+    env = dict(os.environ, **BENCH_ENV)
+    probe = subprocess.run(
+        [sys.executable, '-c', 'import sys, gs2jira; print(",".join(m for m in ("gspread", "jira", "dateutil", "asyncio", "aiohttp") if m in sys.modules))'],
+        cwd=HERE, env=env, capture_output=True, text=True
+    )
+    loaded = probe.stdout.strip()
+    print(f'backends loaded by import: {loaded or "none"}')
+
+    importtime = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import gs2jira'],
+        cwd=HERE, env=env, capture_output=True, text=True
+    )
+    own = [line for line in importtime.stderr.splitlines() if line.rstrip().endswith('| gs2jira')]
+    if own:
+        cumulative_us = int(own[-1].split('|')[1])
+        print(f'import gs2jira: {cumulative_us / 1000:.1f} ms cumulative')
+
+    baseline = statistics.median(timed_run([sys.executable, '-c', 'pass'], args.repeat))
+    print(f'{"interpreter start-up":<24}{baseline * 1000:8.1f} ms')
+    for name, argv in (('--help', [SCRIPT, '--help']), ('validate', [SCRIPT, 'validate'])):
+        median = statistics.median(timed_run([sys.executable] + argv, args.repeat))
+        print(f'{name:<24}{median * 1000:8.1f} ms')
+
+class FakeSpreadsheet:
+    """
+    Stands in for a gspread Spreadsheet, generating `rows` inventory rows on demand
+    """
+    def __init__(self, cfg, rows):
+        self.cfg = cfg
+        self.rows = rows
+        self.width = max(cfg.flag_indices + (cfg.item_col, cfg.tool_owner_col, cfg.data_owner_col)) + 1
+
+    def record(self, row):
+        values = [''] * self.width
+        values[self.cfg.item_col] = f'System {row}'
+        values[self.cfg.tool_owner_col] = f'Owner {row % 40}'
+        values[self.cfg.data_owner_col] = f'Owner {(row + 7) % 40}'
+        for bit, idx in enumerate(self.cfg.flag_indices):
+            values[idx] = 'Yes' if (row >> bit) & 1 else 'No'
+        return values
+
+    def values_batch_get(self, ranges, params=None):
+        value_ranges = []
+        for range_name in ranges:
+            start, end = [int(val) for val in range_name.rsplit('!', 1)[1].split(':')]
+            value_ranges.append({'values': [self.record(row) for row in range(start, min(end, self.rows) + 1)]})
+        return {'valueRanges': value_ranges}
+
+    def owner_rows(self):
+        return [[f'Owner {idx}', f'account-{idx}'] for idx in range(40)]
+
+def bench_memory(args):
+    """
+    Compare tracemalloc peaks of chunked and whole-range reads as the sheet grows
+    """
+    import gs2jira
+
+    print(f'{"rows":>8}{"chunk size":>12}{"peak MiB":>10}{"seconds":>9}')
+    for rows in args.rows:
+        cfg = gs2jira.load_config(dict(BENCH_ENV, DATA_RANGE=f'1:{rows}', OWNER_ID='B'))
+        sh = FakeSpreadsheet(cfg, rows)
+        limiter = gs2jira.RateLimiter(0)
+        owners = gs2jira.OwnerResolver(cfg, gs2jira.load_owner_directory(cfg, sh.owner_rows()))
+        for chunk_size in (args.chunk_size, 0):
+            def submit(epic_key, batch):
+                # serialise like the Jira client would, then drop the result
+                for _, issue_dict in batch:
+                    json.dumps(issue_dict)
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            chunks = gs2jira.iter_sheet_chunks(cfg, sh, 'Inventory', limiter, chunk_size)
+            gs2jira.sync_rows(cfg, chunks, owners, submit)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f'{rows:>8}{chunk_size or rows:>12}{peak / 2**20:>10.2f}{elapsed:>9.2f}')
+
+def bench_fetch(args):
+    """
+    Compare download size and parse time of DATA_RANGE as values API JSON and as a CSV export
+    """
+    import gs2jira
+
+    print(f'{"rows":>8}{"fetch":>10}{"KiB":>10}{"parse ms":>10}')
+    for rows in args.rows:
+        cfg = gs2jira.load_config(dict(BENCH_ENV, DATA_RANGE=f'1:{rows}'))
+        sheet = FakeSpreadsheet(cfg, rows)
+        records = [sheet.record(row) for row in range(1, rows + 1)]
+        payload = json.dumps({'valueRanges': [{'range': f'Inventory!A1:BB{rows}', 'majorDimension': 'ROWS', 'values': records}]})
+        export = io.StringIO()
+        csv.writer(export).writerows(records)
+        export = export.getvalue()
+
+        class JSONSpreadsheet:
+            def values_batch_get(self, ranges, params=None):
+                return json.loads(payload)
+
+        limiter = gs2jira.RateLimiter(0)
+        indices, _ = gs2jira.column_ranges(cfg, 'Inventory')
+        for name, size, parse in (
+            ('values', len(payload), lambda: gs2jira.iter_sheet_chunks(cfg, JSONSpreadsheet(), 'Inventory', limiter, 0)),
+            ('csv', len(export), lambda: gs2jira.rows_from_csv(cfg, io.StringIO(export), 0)),
+            # what a run with preflight parses, the configured columns only
+            ('csv cols', len(export), lambda: [gs2jira.columns_from_csv(cfg, indices, io.StringIO(export))]),
+        ):
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for _ in parse():
+                    pass
+                times.append(time.perf_counter() - start)
+            print(f'{rows:>8}{name:>10}{size / 1024:>10.0f}{statistics.median(times) * 1000:>10.1f}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('imports', help='start-up time of --help and validate').set_defaults(func=bench_imports)
+    memory = subparsers.add_parser('memory', help='peak memory of streaming vs whole-range reads')
+    memory.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000])
+    memory.add_argument('--chunk-size', type=int, default=200)
+    memory.set_defaults(func=bench_memory)
+    fetch = subparsers.add_parser('fetch', help='values API JSON vs CSV export payload size and parse time')
+    fetch.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000])
+    fetch.set_defaults(func=bench_fetch)
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
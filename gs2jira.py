@@ -5,14 +5,16 @@
 Script for converting google sheet rows to Jira tickets
 """
 
-import os, gspread, time
-from gspread.exceptions import GSpreadException
+# gspread and jira are imported inside the functions that use them,
+# so --help, validate and dry runs don't pay for loading the backends
+
+import io, os, sys, csv, json, math, time, argparse, functools, threading, itertools, contextlib
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from jira import JIRA
-from jira.exceptions import JIRAError
-from dateutil.parser import parse
-from dateutil.relativedelta import relativedelta
-from datetime import date, timedelta
+from urllib.parse import urlsplit
+from datetime import date, datetime
+from dataclasses import dataclass
+from typing import Optional, Tuple
 
 __author__ = "bursno22"
 __license__ = "MIT"
@@ -30,1493 +32,3870 @@ def index_from_col(col_name):
         index += (ord(col_name[idx].upper()) - 64) * pow(26, (len(col_name)-idx-1))
     return index - 1
 
-def main():
-    # Open Google Sheet
+def col_from_index(index):
+    """
+    Return column name from index, the inverse of index_from_col
+    For example, A for 0, AA for 26, etc
+    """
+    name = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        name = chr(65 + rem) + name
+    return name
+
+class ConfigError(ValueError):
+    """
+    Raised when the settings in the environment are missing or malformed
+    """
+
+@dataclass(frozen=True)
+class Config:
+    """
+    Settings loaded from the environment once at startup
+    Column settings are kept as resolved 0-based indices so the row loop never parses them again
+    """
+    sheet_name: str
+    primary_sheet: int
+    secondary_sheet: int
+    first_row: int
+    last_row: int
+    item_col: int
+    tool_owner_col: int
+    data_owner_col: int
+    owner_id_col: int
+    flag_indices: Tuple[int, ...]
+    jira_server_url: str
+    jira_username: str
+    jira_token: str
+    jira_project_key: str
+    jira_ticket_type: str
+    jira_subtask_type: str
+    jira_epic_key: str
+    jira_max_attempts: int
+    doc_url: str
+    dead_letter_file: str
+    chunk_size: int
+    sheet_fetch: str
+    owner_cache_file: str
+    user_search_cache_file: str
+    jira_metadata_cache_file: str
+    jira_metadata_ttl: int
+    user_search_ttl: int
+    user_search_negative_ttl: int
+    invalid_mentions: str
+    issue_key_col: Optional[int]
+    epic_col: Optional[int]
+    priority: str
+    priority_col: Optional[int]
+    target_date_cols: Tuple[Optional[int], ...]
+    target_date_offsets: Tuple[Optional[Tuple[int, str]], ...]
+    target_date_base_col: Optional[int]
+    jira_backend: str
+    jira_concurrency: int
+    watch_min_interval: int
+    watch_max_interval: int
+    sheets_reads_per_minute: int
+    jira_writes_per_minute: int
+    reconcile_transition: str
+
+def load_config(env=os.environ):
+    """
+    Read and validate every setting, reporting all problems at once
+    """
+    errors = []
+
+    def required(name):
+        value = (env.get(name) or '').strip()
+        if not value:
+            errors.append(f'{name} is not set')
+        return value
+
+    def integer(name, default=None):
+        value = (env.get(name) or '').strip() or default
+        if value is None:
+            errors.append(f'{name} is not set')
+            return 0
+        try:
+            return int(value)
+        except ValueError:
+            errors.append(f'{name} must be an integer, got {value!r}')
+            return 0
+
+    def column(name, value=None):
+        value = (value if value is not None else required(name)).strip()
+        if value and not (value.isascii() and value.isalpha()):
+            errors.append(f'{name} must be a column letter like C or AA, got {value!r}')
+            return 0
+        return index_from_col(value) if value else 0
+
+    first_row = last_row = 0
+    data_range = required('DATA_RANGE')
+    if data_range:
+        try:
+            first_row, last_row = [int(val) for val in data_range.split(':')]
+            if not 0 < first_row <= last_row:
+                raise ValueError
+        except ValueError:
+            errors.append(f'DATA_RANGE must look like 7:168, got {data_range!r}')
+
+    flag_columns = required('TABLE_FLAG_COLUMNS')
+    flag_indices = tuple(column('TABLE_FLAG_COLUMNS', col) for col in flag_columns.split(',') if flag_columns)
+
+    # One entry per TABLE_FLAG_COLUMNS control, empty entries leave that control's date alone
+    def per_control(name):
+        value = (env.get(name) or '').strip()
+        entries = [entry.strip() for entry in value.split(',')] if value else []
+        if entries and len(entries) != len(flag_indices):
+            errors.append(f'{name} needs one entry per TABLE_FLAG_COLUMNS column, got {len(entries)}')
+        return entries
+
+    target_date_cols = tuple(column('TARGET_DATE_COLUMNS', entry) if entry else None
+                             for entry in per_control('TARGET_DATE_COLUMNS'))
+    offset_units = {'d': 'days', 'w': 'weeks', 'm': 'months', 'y': 'years'}
+    target_date_offsets = []
+    for entry in per_control('TARGET_DATE_OFFSETS'):
+        if not entry:
+            target_date_offsets.append(None)
+        elif entry[:-1].lstrip('-').isdigit() and entry[-1].lower() in offset_units:
+            target_date_offsets.append((int(entry[:-1]), offset_units[entry[-1].lower()]))
+        else:
+            errors.append(f'TARGET_DATE_OFFSETS entries must look like 30d, 6w, 3m or 1y, got {entry!r}')
+            target_date_offsets.append(None)
+
+    cfg = Config(
+        sheet_name=required('SHEET_NAME'),
+        primary_sheet=integer('PRIMARY_SHEET'),
+        secondary_sheet=integer('SECONDARY_SHEET'),
+        first_row=first_row,
+        last_row=last_row,
+        item_col=column('ITEM_NAME'),
+        tool_owner_col=column('TOOL_OWNER'),
+        data_owner_col=column('DATA_OWNER'),
+        owner_id_col=column('OWNER_ID'),
+        flag_indices=flag_indices,
+        jira_server_url=required('JIRA_SERVER_URL'),
+        jira_username=required('JIRA_USERNAME'),
+        jira_token=required('JIRA_OAUTH_TOKEN'),
+        jira_project_key=required('JIRA_PROJECT_KEY'),
+        jira_ticket_type=(env.get('JIRA_TICKET_TYPE') or 'Task').strip(),
+        jira_subtask_type=(env.get('JIRA_SUBTASK_TYPE') or '').strip(),
+        jira_epic_key=required('JIRA_EPIC_KEY'),
+        jira_max_attempts=integer('JIRA_MAX_ATTEMPTS', '3'),
+        doc_url=required('DOC_URL'),
+        dead_letter_file=(env.get('DEAD_LETTER_FILE') or 'dead_letter.jsonl').strip(),
+        chunk_size=integer('CHUNK_SIZE', '200'),
+        sheet_fetch=(env.get('SHEET_FETCH') or 'values').strip().lower(),
+        owner_cache_file=(env.get('OWNER_CACHE_FILE') or '.owner_cache.json').strip(),
+        user_search_cache_file=(env.get('USER_SEARCH_CACHE_FILE') or '.user_search_cache.json').strip(),
+        jira_metadata_cache_file=(env.get('JIRA_METADATA_CACHE_FILE') or '.jira_metadata_cache.json').strip(),
+        jira_metadata_ttl=integer('JIRA_METADATA_TTL', '86400'),
+        user_search_ttl=integer('USER_SEARCH_TTL', '86400'),
+        user_search_negative_ttl=integer('USER_SEARCH_NEGATIVE_TTL', '3600'),
+        invalid_mentions=(env.get('INVALID_MENTIONS') or 'report').strip().lower(),
+        issue_key_col=column('ISSUE_KEY_COLUMN') if (env.get('ISSUE_KEY_COLUMN') or '').strip() else None,
+        epic_col=column('EPIC_COLUMN') if (env.get('EPIC_COLUMN') or '').strip() else None,
+        priority=(env.get('PRIORITY') or 'sheet').strip().lower(),
+        priority_col=column('PRIORITY_COLUMN') if (env.get('PRIORITY_COLUMN') or '').strip() else None,
+        target_date_cols=target_date_cols,
+        target_date_offsets=tuple(target_date_offsets),
+        target_date_base_col=column('TARGET_DATE_BASE') if (env.get('TARGET_DATE_BASE') or '').strip() else None,
+        jira_backend=(env.get('JIRA_BACKEND') or 'sync').strip().lower(),
+        jira_concurrency=integer('JIRA_CONCURRENCY', '10'),
+        watch_min_interval=integer('WATCH_MIN_INTERVAL', '30'),
+        watch_max_interval=integer('WATCH_MAX_INTERVAL', '600'),
+        sheets_reads_per_minute=integer('SHEETS_READS_PER_MINUTE', '60'),
+        jira_writes_per_minute=integer('JIRA_WRITES_PER_MINUTE', '0'),
+        reconcile_transition=(env.get('RECONCILE_TRANSITION') or 'Done').strip(),
+    )
+    doc_url = urlsplit(cfg.doc_url)
+    if cfg.doc_url and (doc_url.scheme not in ('http', 'https') or not doc_url.netloc):
+        # the description links it as an inlineCard, which Jira only accepts with an http(s) URL
+        errors.append(f'DOC_URL must be an http(s) URL, got {cfg.doc_url!r}')
+    if cfg.chunk_size < 0:
+        errors.append(f'CHUNK_SIZE must not be negative, got {cfg.chunk_size}')
+    if cfg.sheet_fetch not in ('values', 'csv'):
+        errors.append(f'SHEET_FETCH must be values or csv, got {cfg.sheet_fetch!r}')
+    if not 0 < cfg.watch_min_interval <= cfg.watch_max_interval:
+        errors.append('WATCH_MIN_INTERVAL must be positive and not above WATCH_MAX_INTERVAL')
+    if cfg.priority not in ('sheet', 'target-date', 'column'):
+        errors.append(f'PRIORITY must be sheet, target-date or column, got {cfg.priority!r}')
+    if cfg.priority == 'column' and cfg.priority_col is None:
+        errors.append('PRIORITY=column needs PRIORITY_COLUMN')
+    if cfg.jira_backend not in ('sync', 'async'):
+        errors.append(f'JIRA_BACKEND must be sync or async, got {cfg.jira_backend!r}')
+    if cfg.invalid_mentions not in ('report', 'block'):
+        errors.append(f'INVALID_MENTIONS must be report or block, got {cfg.invalid_mentions!r}')
+    if errors:
+        raise ConfigError('invalid configuration:\n  ' + '\n  '.join(errors))
+    return cfg
+
+def connect_jira(cfg):
+    """
+    Return an authenticated JIRA client for the configured server
+    """
+    from jira import JIRA
+
+    class CachedJIRA(JIRA):
+        # the server info and field list the client reads on every start come from the metadata cache
+        def server_info(self):
+            return jira_metadata(cfg, self, 'serverInfo')
+
+        def fields(self):
+            return jira_metadata(cfg, self, 'field')
+
+    with span('jira connect'):
+        auth_jira = CachedJIRA(
+            options={'server': cfg.jira_server_url, 'rest_api_version': 3},
+            basic_auth=(cfg.jira_username, cfg.jira_token)
+        )
+    auth_jira._session.hooks['response'].append(record_status)
+    return auth_jira
+
+jira_metadata_lock = threading.Lock()
+
+def read_jira_metadata_cache(cfg):
+    if not os.path.exists(cfg.jira_metadata_cache_file):
+        return {}
+    try:
+        with open(cfg.jira_metadata_cache_file, encoding='utf-8') as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+def jira_metadata(cfg, auth_jira, path, params=None):
+    """
+    GET a read-only Jira resource through JIRA_METADATA_CACHE_FILE
+    Entries younger than JIRA_METADATA_TTL are returned without a request, older ones are revalidated
+    with If-None-Match / If-Modified-Since, so an unchanged resource costs a 304 and no body
+    """
+    url = auth_jira._get_url(path)
+    key = url + ('?' + '&'.join(f'{name}={value}' for name, value in sorted(params.items())) if params else '')
+    with jira_metadata_lock:
+        entry = read_jira_metadata_cache(cfg).get(key)
+    if entry and time.time() - entry['fetched_at'] < cfg.jira_metadata_ttl:
+        return entry['body']
+
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    from jira.exceptions import JIRAError
+    try:
+        response = call_jira(cfg, auth_jira._session.get, url, params=params, headers=headers)
+        body = response.json()
+    except JIRAError as err:
+        # the jira session raises on 304 Not Modified too
+        if err.status_code != 304 or not entry:
+            raise
+        response, body = err.response, entry['body']
+    previous = entry or {}
+    entry = {
+        'etag': response.headers.get('ETag') or previous.get('etag'),
+        'last_modified': response.headers.get('Last-Modified') or previous.get('last_modified'),
+        'fetched_at': time.time(),
+        'body': body,
+    }
+    with jira_metadata_lock:
+        cache = read_jira_metadata_cache(cfg)
+        cache[key] = entry
+        tmp_path = cfg.jira_metadata_cache_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cfg.jira_metadata_cache_file)
+    return entry['body']
+
+def check_issue_types(cfg, auth_jira):
+    """
+    Stop before anything is written when the project doesn't offer JIRA_TICKET_TYPE or JIRA_SUBTASK_TYPE
+    """
+    project = jira_metadata(cfg, auth_jira, f'project/{cfg.jira_project_key}')
+    issue_types = {issue_type['name']: issue_type.get('subtask', False) for issue_type in project.get('issueTypes', [])}
+    if cfg.jira_ticket_type not in issue_types:
+        raise SystemExit(f'project {cfg.jira_project_key} has no issue type {cfg.jira_ticket_type!r}, '
+                         f'it offers {", ".join(sorted(issue_types))}')
+    if cfg.jira_subtask_type and not issue_types.get(cfg.jira_subtask_type):
+        raise SystemExit(f'project {cfg.jira_project_key} has no sub-task type {cfg.jira_subtask_type!r}')
+
+def connect_gspread():
+    """
+    Return a gspread client authorized with the stored OAuth credentials
+    """
+    import gspread
     gc = gspread.oauth()
-    sh = gc.open(os.getenv('SHEET_NAME'))
-    primary_worksheet = sh.get_worksheet(int(os.getenv('PRIMARY_SHEET')))
-    secondary_worksheet = sh.get_worksheet(int(os.getenv('SECONDARY_SHEET')))
-    jira_server_url = os.getenv('JIRA_SERVER_URL')
+    gc.session.hooks['response'].append(record_status)
+    return gc
+
+def call_jira(cfg, func, *args, **kwargs):
+    """
+    Call a JIRA client method, retrying on rate limit and server errors
+    The number of attempts made is attached to the raised JIRAError as `attempts`
+    """
+    from jira.exceptions import JIRAError
+    attempt = 0
+    attributes = {'jira.target': args[0]} if args and isinstance(args[0], str) else {}
+    with span(func.__name__.lstrip('_'), **attributes) as attributes:
+        while True:
+            attempt += 1
+            attributes['retry.attempts'] = attempt
+            try:
+                return func(*args, **kwargs)
+            except JIRAError as err:
+                retriable = err.status_code == 429 or (err.status_code or 0) >= 500
+                if not retriable or attempt >= cfg.jira_max_attempts:
+                    err.attempts = attempt
+                    raise
+                time.sleep(2 ** attempt)
 
-    row_range = [int(val) for val in os.getenv('DATA_RANGE').split(':')]
+dead_letter_lock = threading.Lock()
 
-    for row in range(row_range[0], row_range[1]+1):
-        # Google spread has limit of 100 read request per 100 seconds, 
-        # So we put some 2 seconds sleep before every read to avoid quot exceed exception
-        time.sleep(2)
+def dead_letter_key(entry):
+    """
+    Return what identifies a dead-letter entry, a row has one per stage and one per sub-task
+    """
+    summary = entry['issue_dict'].get('summary') if entry['stage'] == 'subtask' else None
+    return entry['row'], entry['stage'], summary
+
+def dead_letter(path, row, stage, issue_dict, err, issue_key=None, attempts=None, epic_key=None):
+    """
+    Record a row that failed to sync in the dead-letter JSONL file, replacing its earlier entry for the same stage
+    stage is 'create' when the issue was never created, 'link' when only the epic link failed
+    and 'subtask' when a control sub-task of an existing ticket was not created
+    """
+    entry = {
+        'row': row,
+        'stage': stage,
+        'issue_key': issue_key,
+        'epic_key': epic_key,
+        'issue_dict': issue_dict,
+        'error': type(err).__name__,
+        'status': getattr(err, 'status_code', None),
+        'message': getattr(err, 'text', None) or str(err),
+        'attempts': attempts if attempts is not None else getattr(err, 'attempts', 1),
+        'failed_at': datetime.utcnow().isoformat() + 'Z',
+    }
+    with dead_letter_lock:
+        # a row failing again on the next run must not be replayed twice
+        entries = load_dead_letters(path)
+        kept = [old for old in entries if dead_letter_key(old) != dead_letter_key(entry)]
+        if len(kept) == len(entries):
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            return
+        tmp_path = path + '.replace'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for old in kept + [entry]:
+                f.write(json.dumps(old, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, path)
+
+def load_dead_letters(path):
+    """
+    Return the entries recorded in the dead-letter file, or an empty list when there is none
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def replay(cfg, dead_letter_path):
+    """
+    Resubmit rows from the dead-letter file through the bulk create endpoint
+    Rows that fail again are written back to the file with their attempt count increased
+    """
+    from jira.exceptions import JIRAError
+    entries = load_dead_letters(dead_letter_path)
+    if not entries:
+        print(f'nothing to replay in {dead_letter_path}')
+        return
+    # files written before entries were replaced can hold a row several times, the latest entry wins
+    latest = {}
+    for entry in entries:
+        latest.pop(dead_letter_key(entry), None)
+        latest[dead_letter_key(entry)] = entry
+    linked = {entry['row'] for entry in latest.values() if entry['stage'] == 'link'}
+    # a link entry means the ticket exists, an older create entry of the row would duplicate it
+    entries = [entry for entry in latest.values() if not (entry['stage'] == 'create' and entry['row'] in linked)]
+
+    sh = title = None
+    if cfg.issue_key_col is not None:
+        # a later sync may have created the row already, replaying it would make a duplicate ticket
+        sh = connect_gspread().open(cfg.sheet_name)
+        title = worksheet_titles(cfg, sh)[0]
+        col = col_from_index(cfg.issue_key_col)
+        keys = read_ranges(sh, [f"'{title}'!{col}{cfg.first_row}:{col}{cfg.last_row}"],
+                           RateLimiter(cfg.sheets_reads_per_minute), 'COLUMNS')[0]
+        keys = keys[0] if keys else []
+        created = {cfg.first_row + offset for offset, key in enumerate(keys) if key.strip()}
+        done = [entry for entry in entries if entry['stage'] == 'create' and entry['row'] in created]
+        for entry in done:
+            print(f'row {entry["row"]}: already has a ticket, dropped from {dead_letter_path}')
+        entries = [entry for entry in entries if entry not in done]
+        if not entries:
+            os.remove(dead_letter_path)
+            return
+
+    auth_jira = connect_jira(cfg)
+    failed_path = dead_letter_path + '.tmp'
+    if os.path.exists(failed_path):
+        os.remove(failed_path)
+
+    # Rows whose issue already exists only need the epic link
+    to_link = [entry for entry in entries if entry['stage'] == 'link']
+    to_create = [entry for entry in entries if entry['stage'] != 'link']
+    for entry in entries:
+        entry['epic_key'] = entry.get('epic_key') or cfg.jira_epic_key
+
+    # Documents Jira would reject stay in the file without a request, fix the sheet and sync again instead
+    for entry in list(to_create):
+        problems = validate_adf(entry['issue_dict'].get('description') or {'type': 'doc', 'content': []})
+        if problems:
+            to_create.remove(entry)
+            err = InvalidDocument('; '.join(problems))
+            print(f'row {entry["row"]}: {err}')
+            dead_letter(failed_path, entry['row'], entry['stage'], entry['issue_dict'], err,
+                        attempts=entry['attempts'], epic_key=entry['epic_key'])
+
+    # Jira accepts at most 50 issues per bulk create request
+    for start in range(0, len(to_create), 50):
+        chunk = to_create[start:start+50]
+        try:
+            with rows_context(entry['row'] for entry in chunk):
+                results = call_jira(cfg, auth_jira.create_issues,
+                                    field_list=[rest_fields(entry['issue_dict']) for entry in chunk], prefetch=False)
+        except JIRAError as err:
+            for entry in chunk:
+                dead_letter(failed_path, entry['row'], entry['stage'], entry['issue_dict'], err,
+                            attempts=entry['attempts'] + getattr(err, 'attempts', 1), epic_key=entry['epic_key'])
+            continue
+        for entry, result in zip(chunk, results):
+            if result['status'] == 'Success' and entry['stage'] == 'subtask':
+                # sub-tasks follow their parent's epic and have no key column of their own
+                print(f'create new sub-task {result["issue"].key}')
+            elif result['status'] == 'Success':
+                entry['issue_key'] = result['issue'].key
+                to_link.append(entry)
+                print(f'create new ticket {entry["issue_key"]}')
+            else:
+                err = JIRAError(text=json.dumps(result['error']))
+                dead_letter(failed_path, entry['row'], entry['stage'], entry['issue_dict'], err,
+                            attempts=entry['attempts'] + 1, epic_key=entry['epic_key'])
 
-        # Read one row from google spread sheet
-        record = primary_worksheet.row_values(row)
-        item_name = record[index_from_col(os.getenv('ITEM_NAME'))]
-        tool_owner = record[index_from_col(os.getenv('TOOL_OWNER'))]
-        data_owner = record[index_from_col(os.getenv('DATA_OWNER'))]
+    if sh is not None:
+        write_issue_keys(cfg, sh, title, {entry['row']: entry['issue_key'] for entry in to_link if entry['stage'] != 'link'})
 
-        # Get tool_owner's Jira ID
-        owner_id = ''
+    by_epic = {}
+    for entry in to_link:
+        by_epic.setdefault(entry['epic_key'], []).append(entry)
+    for epic_key, linked in by_epic.items():
         try:
-            find_owner = secondary_worksheet.find(tool_owner)
-            owner_id = secondary_worksheet.cell(find_owner.row, index_from_col(os.getenv('OWNER_ID'))+1).value
-        except GSpreadException as err:
-            pass
+            epic = jira_metadata(cfg, auth_jira, f'issue/{epic_key}', {'fields': 'summary,issuetype'})
+            with rows_context(entry['row'] for entry in linked):
+                call_jira(cfg, auth_jira.add_issues_to_epic, epic['id'], [entry['issue_key'] for entry in linked])
+        except JIRAError as err:
+            for entry in linked:
+                dead_letter(failed_path, entry['row'], 'link', entry['issue_dict'], err,
+                            issue_key=entry['issue_key'],
+                            attempts=entry['attempts'] + getattr(err, 'attempts', 1), epic_key=epic_key)
+
+    if cfg.jira_subtask_type:
+        # sync renders sub-tasks only once their parent exists, so a recreated parent still needs them
+        subtasks = [(entry['row'], fields) for entry in to_link if entry['stage'] == 'create'
+                    for fields in render_subtasks(cfg, entry['issue_dict'], entry['issue_key'])]
+        for start in range(0, len(subtasks), 50):
+            part = subtasks[start:start+50]
+            try:
+                with rows_context(row for row, _ in part):
+                    results = call_jira(cfg, auth_jira.create_issues,
+                                        field_list=[rest_fields(fields) for _, fields in part], prefetch=False)
+            except JIRAError as err:
+                for row, fields in part:
+                    dead_letter(failed_path, row, 'subtask', fields, err)
+                continue
+            for (row, fields), result in zip(part, results):
+                if result['status'] == 'Success':
+                    print(f'create new sub-task {result["issue"].key}')
+                else:
+                    dead_letter(failed_path, row, 'subtask', fields, JIRAError(text=json.dumps(result['error'])))
+
+    if os.path.exists(failed_path):
+        os.replace(failed_path, dead_letter_path)
+        print(f'{len(load_dead_letters(dead_letter_path))} rows still failing, see {dead_letter_path}')
+    else:
+        os.remove(dead_letter_path)
+        print(f'replayed {len(entries)} rows')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--dead-letter',
+                        help='JSONL file collecting rows that failed to sync, with --manifest each target name is added before .jsonl')
+    parser.add_argument('--manifest',
+                        help='JSON file listing several sheet, range and epic targets to process in one run')
+    parser.add_argument('--profile', nargs='?', const='gs2jira-profile', metavar='PREFIX',
+                        help='profile the run, writing PREFIX.pstats and PREFIX.collapsed flame graph data')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='write a span for every Sheets and Jira call to FILE as OTLP JSON')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='read the sheet and render tickets without writing to Jira')
+    parser.add_argument('--chunk-size', type=int,
+                        help='rows read from the sheet per request, 0 reads the whole range at once')
+    parser.add_argument('--fetch', choices=('values', 'csv'),
+                        help='read DATA_RANGE through the values API or one CSV export of the worksheet')
+    parser.add_argument('--refresh-owners', action='store_true',
+                        help='reread the owner sheet even if the cached directory is current')
+    parser.add_argument('--no-preflight', action='store_true',
+                        help="don't validate the whole sheet before writing")
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('sync', help='create Jira tickets from the sheet rows (default)')
+    subparsers.add_parser('replay', help='resubmit the rows recorded in the dead-letter file')
+    subparsers.add_parser('reconcile', help='move the tickets of rows removed from the sheet through RECONCILE_TRANSITION')
+    subparsers.add_parser('watch', help='keep running and sync whenever the sheet changes')
+    validate = subparsers.add_parser('validate', help='check the configuration and exit')
+    validate.add_argument('--sheet', action='store_true', help='also validate every row of DATA_RANGE')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    with contextlib.ExitStack() as stack:
+        if args.trace:
+            stack.enter_context(Tracer(args.trace))
+        if args.profile:
+            stack.enter_context(Profiler(args.profile))
+        run(args)
 
-        # Get data_owner's Jira ID
-        data_owner_id = ''
+def run(args):
+    if args.manifest:
         try:
-            find_owner = secondary_worksheet.find(data_owner)
-            data_owner_id = secondary_worksheet.cell(find_owner.row, index_from_col(os.getenv('OWNER_ID'))+1).value
-        except GSpreadException as err:
-            pass
-
-        template = {
-            "type": "doc",
-            "version": 1,
-            "content": [{
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "Application: ",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    },
-                    {
-                        "text": item_name,
-                        "type": "text"
-                    },
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "Business Owner: ",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "mention",
-                        "attrs": {
-                            "id": owner_id,
-                            "text": tool_owner,
-                            "userType": "DEFAULT"
+            targets = load_manifest(args.manifest, dead_letter=args.dead_letter)
+        except ConfigError as err:
+            raise SystemExit(str(err))
+        if args.command == 'validate':
+            print(f'{len(targets)} targets are valid')
+            if args.sheet:
+                failed = []
+                for name, target_cfg in targets:
+                    print(f'[{name}] checking the sheet')
+                    try:
+                        validate_sheet(target_cfg)
+                    except SystemExit:
+                        failed.append(name)
+                if failed:
+                    raise SystemExit(f'sheet validation failed for: {", ".join(failed)}')
+        elif args.command == 'replay':
+            for _, target_cfg in targets:
+                replay(target_cfg, target_cfg.dead_letter_file)
+        elif args.command == 'reconcile':
+            # targets sharing an epic are reconciled together, so one's tickets are never another's orphans
+            with Clients(targets[0][1]) as clients:
+                reconcile(targets, dry_run=args.dry_run, clients=clients)
+        elif args.command == 'watch':
+            with Clients(targets[0][1]) as clients:
+                watch(targets, clients, dry_run=args.dry_run, chunk_size=args.chunk_size, fetch=args.fetch,
+                      refresh_owners=args.refresh_owners, check=not args.no_preflight)
+        else:
+            # clients take the Jira and quota settings of the first target
+            with Clients(targets[0][1]) as clients:
+                sync_manifest(targets, clients, dry_run=args.dry_run, chunk_size=args.chunk_size, fetch=args.fetch,
+                              refresh_owners=args.refresh_owners, check=not args.no_preflight)
+        return
+
+    try:
+        cfg = load_config()
+    except ConfigError as err:
+        raise SystemExit(str(err))
+    dead_letter_path = args.dead_letter or cfg.dead_letter_file
+    if args.command == 'validate':
+        print('configuration is valid')
+        if args.sheet:
+            validate_sheet(cfg)
+    elif args.command == 'replay':
+        replay(cfg, dead_letter_path)
+    elif args.command == 'reconcile':
+        with Clients(cfg) as clients:
+            reconcile([('sheet', cfg)], dry_run=args.dry_run, clients=clients)
+    elif args.command == 'watch':
+        with Clients(cfg) as clients:
+            watch([('sheet', cfg)], clients, dry_run=args.dry_run, chunk_size=args.chunk_size, fetch=args.fetch,
+                  refresh_owners=args.refresh_owners, check=not args.no_preflight)
+    else:
+        with Clients(cfg) as clients:
+            sync(cfg, dead_letter_path, dry_run=args.dry_run, chunk_size=args.chunk_size, fetch=args.fetch,
+                 refresh_owners=args.refresh_owners, check=not args.no_preflight, clients=clients)
+
+def build_description(cfg, item_name, tool_owner, owner_id, data_owner, data_owner_id, flags):
+    """
+    Return the ADF description of a ticket
+    flags is the Row bit field of TABLE_FLAG_COLUMNS, disabled controls are left out of the table
+    """
+    template = {
+        "type": "doc",
+        "version": 1,
+        "content": [{
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "Application: ",
+                    "marks": [
+                        {
+                            "type": "strong"
                         }
-                    },
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "Data Owner: ",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "mention",
-                        "attrs": {
-                            "id": data_owner_id,
-                            "text": data_owner,
-                            "userType": "DEFAULT"
+                    ]
+                },
+                {
+                    "text": item_name,
+                    "type": "text"
+                },
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "Business Owner: ",
+                    "marks": [
+                        {
+                            "type": "strong"
                         }
-                    },
-                    {
-                        "type": "hardBreak"
-                    }
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "Overview",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    }
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "IT controls are established to ensure that particular requirements driven by internal policies, procedures, standards or by regulatory requirements are in place and effective."
-                    }
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "Moreover, the IT Controls are "
-                    },
-                    {
-                        "type": "text",
-                        "text": "required by regulations",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "text",
-                        "text": " such as "
-                    },
-                    {
-                        "type": "text",
-                        "text": "BalT from BaFin",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "text",
-                        "text": "  (the regulatory authority that provides our Banking license)."
-                    }
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "As such, we require your complete engagement to ensure the successful execution of our planned controls for this year.",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "hardBreak"
-                    }
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "Next Steps",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    }
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "1. "
-                    },
-                    {
-                        "type": "text",
-                        "text": "Review",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "text",
-                        "text": " the IT Controls applicable to system below, noting "
-                    },
-                    {
-                        "type": "text",
-                        "text": "key dates",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "text",
-                        "text": " and incorporating them into your team’s 2021 roadmap."
-                    }
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "2. "
-                    },
-                    {
-                        "type": "text",
-                        "text": "Nominate a delegate",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "text",
-                        "text": " from your team who will be engaged to execute the IT Control (tag their name in the ″Nominated Delegate″ Column)."
+                    ]
+                },
+                {
+                    "type": "mention",
+                    "attrs": {
+                        "id": owner_id,
+                        "text": tool_owner,
+                        "userType": "DEFAULT"
                     }
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "3. "
-                    },
-                    {
-                        "type": "text",
-                        "text": "Flag any concerns",
-                        "marks": [
-                            {
-                                "type": "strong"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "text",
-                        "text": " you have in the comments of this ticket (e.g. timeline conflicts, unclear IT Control guidelines, etc.)"
-                    },
-                    {
-                        "type": "hardBreak"
+                },
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "Data Owner: ",
+                    "marks": [
+                        {
+                            "type": "strong"
+                        }
+                    ]
+                },
+                {
+                    "type": "mention",
+                    "attrs": {
+                        "id": data_owner_id,
+                        "text": data_owner,
+                        "userType": "DEFAULT"
                     }
-                ]
-            },
-            {
-                "type": "paragraph",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "For more details in the 2021 IT Controls see "
-                    },
-                    {
-                        "type": "inlineCard",
-                        "attrs": {
-                            "url": os.getenv('DOC_URL')
+                },
+                {
+                    "type": "hardBreak"
+                }
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "Overview",
+                    "marks": [
+                        {
+                            "type": "strong"
+                        }
+                    ]
+                }
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "IT controls are established to ensure that particular requirements driven by internal policies, procedures, standards or by regulatory requirements are in place and effective."
+                }
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "Moreover, the IT Controls are "
+                },
+                {
+                    "type": "text",
+                    "text": "required by regulations",
+                    "marks": [
+                        {
+                            "type": "strong"
                         }
-                    },
-                    {
-                        "type": "hardBreak"
+                    ]
+                },
+                {
+                    "type": "text",
+                    "text": " such as "
+                },
+                {
+                    "type": "text",
+                    "text": "BalT from BaFin",
+                    "marks": [
+                        {
+                            "type": "strong"
+                        }
+                    ]
+                },
+                {
+                    "type": "text",
+                    "text": "  (the regulatory authority that provides our Banking license)."
+                }
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "As such, we require your complete engagement to ensure the successful execution of our planned controls for this year.",
+                    "marks": [
+                        {
+                            "type": "strong"
+                        }
+                    ]
+                },
+                {
+                    "type": "hardBreak"
+                }
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "Next Steps",
+                    "marks": [
+                        {
+                            "type": "strong"
+                        }
+                    ]
+                }
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "1. "
+                },
+                {
+                    "type": "text",
+                    "text": "Review",
+                    "marks": [
+                        {
+                            "type": "strong"
+                        }
+                    ]
+                },
+                {
+                    "type": "text",
+                    "text": " the IT Controls applicable to system below, noting "
+                },
+                {
+                    "type": "text",
+                    "text": "key dates",
+                    "marks": [
+                        {
+                            "type": "strong"
+                        }
+                    ]
+                },
+                {
+                    "type": "text",
+                    "text": " and incorporating them into your team’s 2021 roadmap."
+                }
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "2. "
+                },
+                {
+                    "type": "text",
+                    "text": "Nominate a delegate",
+                    "marks": [
+                        {
+                            "type": "strong"
+                        }
+                    ]
+                },
+                {
+                    "type": "text",
+                    "text": " from your team who will be engaged to execute the IT Control (tag their name in the ″Nominated Delegate″ Column)."
+                }
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "3. "
+                },
+                {
+                    "type": "text",
+                    "text": "Flag any concerns",
+                    "marks": [
+                        {
+                            "type": "strong"
+                        }
+                    ]
+                },
+                {
+                    "type": "text",
+                    "text": " you have in the comments of this ticket (e.g. timeline conflicts, unclear IT Control guidelines, etc.)"
+                },
+                {
+                    "type": "hardBreak"
+                }
+            ]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "For more details in the 2021 IT Controls see "
+                },
+                {
+                    "type": "inlineCard",
+                    "attrs": {
+                        "url": cfg.doc_url
                     }
-                ]
-            },
-            {
-                "type": "table",
-                "attrs": {
-                    "isNumberColumnEnabled": False,
-                    "layout": "default"
                 },
-                "content": [
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableHeader",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IT Control",
-                                                "marks": [
-                                                    {
-                                                        "type": "strong"
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableHeader",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "Target Date",
-                                                "marks": [
-                                                    {
-                                                        "type": "strong"
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableHeader",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "Nominated Delegate",
-                                                "marks": [
-                                                    {
-                                                        "type": "strong"
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableHeader",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "JIRA Ticket",
-                                                "marks": [
-                                                    {
-                                                        "type": "strong"
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableHeader",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "Oversight Team",
-                                                "marks": [
-                                                    {
-                                                        "type": "strong"
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/ICF-853"
-                                                }
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "15 May 2021"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[@ name]"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": " "
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IRM"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/ACE-902"
-                                                }
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "To be filled by IAM"
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[Access Manager] To be filled by IAM"
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "To be filled by IAM"
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IAM"
-                                            },
-                                            {
-                                                "type": "hardBreak"
-                                            },
-                                            {
-                                                "type": "text",
-                                                "text": "Please see "
-                                            },
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://docs.google.com/presentation/d/15CF6bIJfolm3wGGJqJxN8_Nh5tHwo7oUMYz4GOD7Xs8/edit?usp=sharing"
-                                                }
-                                            },
-                                            {
-                                                "type": "text",
-                                                "text": "for more information regarding the process this year."
-                                            }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/REGTECH-1136"
-                                                }
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "15 Jun 21"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[Access Manager] To be filled by IAM"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "To be filled by IAM"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IAM"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/ICF-877"
+                {
+                    "type": "hardBreak"
+                }
+            ]
+        },
+        {
+            "type": "table",
+            "attrs": {
+                "isNumberColumnEnabled": False,
+                "layout": "default"
+            },
+            "content": [
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableHeader",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IT Control",
+                                            "marks": [
+                                                {
+                                                    "type": "strong"
                                                 }
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "15 Jun 21"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[@ name]"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": " "
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "InfraSec, RegTech"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/IIT-871"
+                                            ]
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableHeader",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "Target Date",
+                                            "marks": [
+                                                {
+                                                    "type": "strong"
                                                 }
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "15 Jul 21"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[@ name]"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": " "
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IRM, IIT"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/REGTECH-1134"
+                                            ]
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableHeader",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "Nominated Delegate",
+                                            "marks": [
+                                                {
+                                                    "type": "strong"
                                                 }
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "15 Jul 21"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[@ name]"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": " "
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IAM"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/PLE-3270"
+                                            ]
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableHeader",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "JIRA Ticket",
+                                            "marks": [
+                                                {
+                                                    "type": "strong"
                                                 }
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "15 Sep 21"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[@ name]"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": " "
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "Platform Engineering"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/ICF-841"
+                                            ]
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableHeader",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "Oversight Team",
+                                            "marks": [
+                                                {
+                                                    "type": "strong"
                                                 }
+                                            ]
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/ICF-853"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": " "
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[@ name]"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": " "
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IRM"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/ICF-892"
-                                                }
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "15 Nov 21"
-                                            }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[@ name]"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "15 May 2021"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[@ name]"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": " "
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IRM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/ACE-902"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": " "
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "To be filled by IAM"
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[Access Manager] To be filled by IAM"
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "To be filled by IAM"
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IAM"
+                                        },
+                                        {
+                                            "type": "hardBreak"
+                                        },
+                                        {
+                                            "type": "text",
+                                            "text": "Please see "
+                                        },
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://docs.google.com/presentation/d/15CF6bIJfolm3wGGJqJxN8_Nh5tHwo7oUMYz4GOD7Xs8/edit?usp=sharing"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IRM"
+                                        },
+                                        {
+                                            "type": "text",
+                                            "text": "for more information regarding the process this year."
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/REGTECH-1136"
                                             }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/REGTECH-1149"
-                                                }
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "To be filled by IAM"
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[Access Manager] To be filled by IAM"
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "To be filled by IAM"
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IAM"
-                                            },
-                                            {
-                                                "type": "hardBreak"
-                                            },
-                                            {
-                                                "type": "text",
-                                                "text": "Please see "
-                                            },
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://docs.google.com/presentation/d/15CF6bIJfolm3wGGJqJxN8_Nh5tHwo7oUMYz4GOD7Xs8/edit?usp=sharing"
-                                                }
-                                            },
-                                            {
-                                                "type": "text",
-                                                "text": "for more information regarding the process this year."
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "15 Jun 21"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[Access Manager] To be filled by IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "To be filled by IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/ICF-877"
                                             }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/REGTECH-1135"
-                                                }
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "15 Jun 21"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[@ name]"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": " "
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "InfraSec, RegTech"
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/IIT-871"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "To be filled by IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "15 Jul 21"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[@ name]"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": " "
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IRM, IIT"
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/REGTECH-1134"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[Access Manager] To be filled by IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "15 Jul 21"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[@ name]"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": " "
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/PLE-3270"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "To be filled by IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "15 Sep 21"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[@ name]"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": " "
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "Platform Engineering"
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/ICF-841"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": " "
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[@ name]"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": " "
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IRM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/ICF-892"
                                             }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/ICF-897"
-                                                }
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "15 Nov 21"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[@ name]"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": " "
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IRM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/REGTECH-1149"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "15 Dec 21"
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "To be filled by IAM"
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[Access Manager] To be filled by IAM"
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "To be filled by IAM"
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IAM"
+                                        },
+                                        {
+                                            "type": "hardBreak"
+                                        },
+                                        {
+                                            "type": "text",
+                                            "text": "Please see "
+                                        },
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://docs.google.com/presentation/d/15CF6bIJfolm3wGGJqJxN8_Nh5tHwo7oUMYz4GOD7Xs8/edit?usp=sharing"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[@ name]"
+                                        },
+                                        {
+                                            "type": "text",
+                                            "text": "for more information regarding the process this year."
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/REGTECH-1135"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": " "
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "To be filled by IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[Access Manager] To be filled by IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "To be filled by IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IAM"
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/ICF-897"
                                             }
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "InfraSec, RegTech"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "15 Dec 21"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[@ name]"
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": " "
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "InfraSec, RegTech"
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+                {
+                    "type": "tableRow",
+                    "content": [
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://number26-jira.atlassian.net/browse/REGTECH-1150"
                                             }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        "type": "tableRow",
-                        "content": [
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://number26-jira.atlassian.net/browse/REGTECH-1150"
-                                                }
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "15 Dec 21"
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "[Access Manager] To be filled by IAM"
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "To be filled by IAM"
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "tableCell",
-                                "content": [
-                                    {
-                                        "type": "paragraph",
-                                        "content": [
-                                            {
-                                                "type": "text",
-                                                "text": "IAM"
-                                            },
-                                            {
-                                                "type": "hardBreak"
-                                            },
-                                            {
-                                                "type": "text",
-                                                "text": "Please see "
-                                            },
-                                            {
-                                                "type": "inlineCard",
-                                                "attrs": {
-                                                    "url": "https://docs.google.com/presentation/d/15CF6bIJfolm3wGGJqJxN8_Nh5tHwo7oUMYz4GOD7Xs8/edit?usp=sharing"
-                                                }
-                                            },
-                                            {
-                                                "type": "text",
-                                                "text": "for more information regarding the process this year."
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "15 Dec 21"
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "[Access Manager] To be filled by IAM"
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "To be filled by IAM"
+                                        },
+                                    ]
+                                }
+                            ]
+                        },
+                        {
+                            "type": "tableCell",
+                            "content": [
+                                {
+                                    "type": "paragraph",
+                                    "content": [
+                                        {
+                                            "type": "text",
+                                            "text": "IAM"
+                                        },
+                                        {
+                                            "type": "hardBreak"
+                                        },
+                                        {
+                                            "type": "text",
+                                            "text": "Please see "
+                                        },
+                                        {
+                                            "type": "inlineCard",
+                                            "attrs": {
+                                                "url": "https://docs.google.com/presentation/d/15CF6bIJfolm3wGGJqJxN8_Nh5tHwo7oUMYz4GOD7Xs8/edit?usp=sharing"
                                             }
-                                        ]
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                ]
-            }]
+                                        },
+                                        {
+                                            "type": "text",
+                                            "text": "for more information regarding the process this year."
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                },
+            ]
+        }]
+    }
+
+    # Show or Hide table row according to pre-defined cell's definition
+    starting_pos = 1
+    for control in range(len(cfg.flag_indices)):
+        # remove according row if its value isn't 'Yes'
+        if not flags >> control & 1:
+            template['content'][-1]['content'].pop(starting_pos)
+        else:
+            starting_pos += 1
+    return template
+
+# Pipeline stage each thread is in, read by the profiler to label its samples
+current_stages = {}
+stage_times = {}
+stage_lock = threading.Lock()
+
+@contextlib.contextmanager
+def stage(name):
+    """
+    Label the enclosed code as pipeline stage `name` and add its wall time to stage_times
+    """
+    thread_id = threading.get_ident()
+    outer = current_stages.get(thread_id)
+    current_stages[thread_id] = name
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if outer is None:
+            del current_stages[thread_id]
+        else:
+            current_stages[thread_id] = outer
+        with stage_lock:
+            total, calls = stage_times.get(name, (0.0, 0))
+            stage_times[name] = (total + elapsed, calls + 1)
+
+class Profiler:
+    """
+    Runs cProfile on the main thread and samples the stacks of every thread, labelled by stage
+    Writes <prefix>.pstats for pstats/snakeviz and <prefix>.collapsed for flamegraph.pl or speedscope
+    """
+    def __init__(self, prefix, interval=0.005):
+        self.prefix = prefix
+        self.interval = interval
+        self.samples = {}
+        self.running = False
+
+    def sample(self):
+        own = threading.get_ident()
+        while self.running:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                names.append(current_stages.get(thread_id, 'other'))
+                key = ';'.join(reversed(names))
+                self.samples[key] = self.samples.get(key, 0) + 1
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        import cProfile
+        self.profile = cProfile.Profile()
+        self.running = True
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+        self.sampler.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.disable()
+        self.running = False
+        self.sampler.join()
+        self.profile.dump_stats(f'{self.prefix}.pstats')
+        with open(f'{self.prefix}.collapsed', 'w', encoding='utf-8') as f:
+            for key, count in sorted(self.samples.items()):
+                f.write(f'{key} {count}\n')
+        print(f'profile written to {self.prefix}.pstats and {self.prefix}.collapsed')
+        for name, (total, calls) in sorted(stage_times.items(), key=lambda item: -item[1][0]):
+            print(f'  {name:<20}{total:10.3f} s{calls:8d} calls')
+
+# Per-thread state of the external call in progress, read by the tracer
+call_context = threading.local()
+tracer = None
+
+@contextlib.contextmanager
+def rows_context(rows):
+    """
+    Tag the spans of the enclosed calls with the sheet rows they act on
+    """
+    previous = getattr(call_context, 'rows', None)
+    call_context.rows = list(rows)
+    try:
+        yield
+    finally:
+        call_context.rows = previous
+
+def record_status(response, *args, **kwargs):
+    """
+    requests response hook remembering the HTTP status of the thread's last call
+    """
+    call_context.status = response.status_code
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """
+    Trace the enclosed external call as a span when --trace is on
+    Yields the span attributes so the caller can add to them
+    """
+    if tracer is None:
+        yield attributes
+        return
+    parent = getattr(call_context, 'span_id', None) or tracer.root_id
+    span_id = os.urandom(8).hex()
+    call_context.span_id = span_id
+    call_context.status = None
+    rows = getattr(call_context, 'rows', None)
+    if rows:
+        attributes['sheet.rows'] = rows
+    start = time.time_ns()
+    error = None
+    try:
+        yield attributes
+    except BaseException as err:
+        error = err
+        raise
+    finally:
+        end = time.time_ns()
+        call_context.span_id = parent if parent != tracer.root_id else None
+        status = getattr(error, 'status_code', None) or call_context.status
+        if status:
+            attributes['http.status_code'] = status
+        tracer.add(name, span_id, parent, start, end, attributes, error)
+
+class Tracer:
+    """
+    Collects spans of a run and writes them as OTLP JSON, which Jaeger and otel-desktop-viewer can import
+    """
+    def __init__(self, path):
+        self.path = path
+        self.trace_id = os.urandom(16).hex()
+        self.root_id = os.urandom(8).hex()
+        self.start = time.time_ns()
+        self.spans = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def attribute(key, value):
+        if isinstance(value, (list, tuple)):
+            return {'key': key, 'value': {'arrayValue': {'values': [Tracer.attribute(key, item)['value'] for item in value]}}}
+        if isinstance(value, bool):
+            return {'key': key, 'value': {'boolValue': value}}
+        if isinstance(value, int):
+            return {'key': key, 'value': {'intValue': str(value)}}
+        return {'key': key, 'value': {'stringValue': str(value)}}
+
+    def add(self, name, span_id, parent, start, end, attributes, error=None):
+        data = {
+            'traceId': self.trace_id,
+            'spanId': span_id,
+            'parentSpanId': parent,
+            'name': name,
+            'kind': 3,
+            'startTimeUnixNano': str(start),
+            'endTimeUnixNano': str(end),
+            'attributes': [self.attribute(key, value) for key, value in attributes.items()],
+            'status': {'code': 1},
         }
+        if error is not None:
+            data['status'] = {'code': 2, 'message': f'{type(error).__name__}: {error}'[:500]}
+        with self.lock:
+            self.spans.append(data)
+
+    def __enter__(self):
+        global tracer
+        tracer = self
+        return self
 
-        # Show or Hide table row according to pre-defined cell's definition
-        table_flag_columns = os.getenv('TABLE_FLAG_COLUMNS')
-        starting_pos = 1
-        for cell in table_flag_columns.split(','):
-            # remove according row if its value isn't 'Yes'
-            if record[index_from_col(cell)] != 'Yes':
-                template['content'][-1]['content'].pop(starting_pos)
+    def __exit__(self, *exc):
+        global tracer
+        tracer = None
+        root = {
+            'traceId': self.trace_id,
+            'spanId': self.root_id,
+            'name': 'gs2jira run',
+            'kind': 1,
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(time.time_ns()),
+            'attributes': [self.attribute('process.command_args', ' '.join(sys.argv))],
+            'status': {'code': 2 if exc[0] else 1},
+        }
+        document = {'resourceSpans': [{
+            'resource': {'attributes': [self.attribute('service.name', 'gs2jira'),
+                                        self.attribute('service.version', __version__)]},
+            'scopeSpans': [{'scope': {'name': 'gs2jira', 'version': __version__}, 'spans': [root] + self.spans}],
+        }]}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+        print(f'{len(self.spans)} spans written to {self.path}')
+
+class RateLimiter:
+    """
+    Spaces out calls so no more than `per_minute` of them start in any minute
+    Safe to share between threads
+    """
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def date_cells(cfg, cell):
+    """
+    Return the raw TARGET_DATE_BASE and TARGET_DATE_COLUMNS cells of a row, () when no dates come from the sheet
+    cell(idx) returns the value of column idx
+    """
+    if cfg.target_date_base_col is None and not cfg.target_date_cols:
+        return ()
+    base = cell(cfg.target_date_base_col).strip() if cfg.target_date_base_col is not None else ''
+    return (base,) + tuple(cell(idx).strip() if idx is not None else '' for idx in cfg.target_date_cols)
+
+class Row:
+    """
+    One DATA_RANGE row, keeping only the configured columns
+    The flag columns are packed into an int, bit i is set when the i-th control reads 'Yes'
+    """
+    __slots__ = ('row', 'item_name', 'tool_owner', 'data_owner', 'flags', 'issue_key', 'epic_key', 'dates')
+
+    def __init__(self, row, item_name, tool_owner, data_owner, flags, issue_key='', epic_key='', dates=()):
+        self.row = row
+        self.item_name = item_name
+        self.tool_owner = tool_owner
+        self.data_owner = data_owner
+        self.flags = flags
+        self.issue_key = issue_key
+        self.epic_key = epic_key
+        self.dates = dates
+
+    @classmethod
+    def from_record(cls, cfg, row, record):
+        # the API leaves out trailing empty cells, so short records are padded
+        width = len(record)
+        flags = 0
+        for bit, idx in enumerate(cfg.flag_indices):
+            if idx < width and record[idx].strip().lower() == 'yes':
+                flags |= 1 << bit
+        item_name, tool_owner, data_owner = (record[idx].strip() if idx < width else ''
+                                             for idx in (cfg.item_col, cfg.tool_owner_col, cfg.data_owner_col))
+        issue_key = ''
+        if cfg.issue_key_col is not None and cfg.issue_key_col < width:
+            issue_key = record[cfg.issue_key_col].strip()
+        epic_key = ''
+        if cfg.epic_col is not None and cfg.epic_col < width:
+            epic_key = record[cfg.epic_col].strip().upper()
+        dates = date_cells(cfg, lambda idx: record[idx] if idx < width else '')
+        return cls(row, item_name, tool_owner, data_owner, flags, issue_key, epic_key or cfg.jira_epic_key, dates)
+
+    def __repr__(self):
+        return f'<Row {self.row} {self.item_name!r} flags={self.flags:#x}>'
+
+def worksheet_properties(cfg, sh):
+    """
+    Return the properties (title, sheetId, ...) of the primary and owner worksheets from a single metadata request
+    """
+    with span('fetch_sheet_metadata'):
+        metadata = sh.fetch_sheet_metadata(params={'fields': 'sheets.properties'})
+    sheets = metadata['sheets']
+    return sheets[cfg.primary_sheet]['properties'], sheets[cfg.secondary_sheet]['properties']
+
+def worksheet_titles(cfg, sh):
+    """
+    Return the titles of the primary and owner worksheets from a single metadata request
+    """
+    primary, secondary = worksheet_properties(cfg, sh)
+    return primary['title'], secondary['title']
+
+def read_ranges(sh, ranges, limiter, major_dimension='ROWS'):
+    """
+    Return the values of every range in `ranges`, fetched with one values_batch_get request
+    """
+    limiter.wait()
+    # the A1 ranges themselves, so a slow or failed read in a trace can be matched to sheet rows
+    with span('values_batch_get', **{'sheet.ranges': list(ranges), 'sheet.range_count': len(ranges)}):
+        response = sh.values_batch_get(ranges, params={'majorDimension': major_dimension})
+    return [value_range.get('values', []) for value_range in response['valueRanges']]
+
+def load_owner_directory(cfg, rows):
+    """
+    Return a dict mapping every value of the owner sheet to the Jira ID of its row
+    The first occurrence wins, the same as Worksheet.find()
+    """
+    owners = {}
+    for values in rows:
+        owner_id = values[cfg.owner_id_col] if cfg.owner_id_col < len(values) else ''
+        for value in values:
+            if value and value not in owners:
+                owners[value] = owner_id
+    return owners
+
+def sheet_revision(gc, spreadsheet_id):
+    """
+    Return the Drive revision of the spreadsheet, which changes on every edit
+    """
+    with span('drive files.get'):
+        response = gc.request(
+            'get', f'https://www.googleapis.com/drive/v3/files/{spreadsheet_id}',
+            params={'fields': 'version,modifiedTime', 'supportsAllDrives': 'true'}
+        )
+    return response.json()['version']
+
+def owner_cache_tag(cfg, gc, sh):
+    """
+    Return what the cached owner directory must match to be reused
+    """
+    return {
+        'spreadsheet': sh.id,
+        'revision': sheet_revision(gc, sh.id),
+        'sheet': cfg.secondary_sheet,
+        'owner_id_col': cfg.owner_id_col,
+    }
+
+# Sheets of a multi-sheet run share OWNER_CACHE_FILE, one entry per spreadsheet and owner sheet
+owner_cache_lock = threading.Lock()
+
+def read_owner_cache(cfg):
+    if not os.path.exists(cfg.owner_cache_file):
+        return {}
+    try:
+        with open(cfg.owner_cache_file, encoding='utf-8') as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+def load_owner_cache(cfg, tag):
+    """
+    Return the owner directory from OWNER_CACHE_FILE, or None when it was saved for another revision
+    """
+    with owner_cache_lock:
+        entry = read_owner_cache(cfg).get(f'{tag["spreadsheet"]}:{tag["sheet"]}')
+    if not isinstance(entry, dict) or entry.get('tag') != tag:
+        return None
+    return entry.get('owners')
+
+def save_owner_cache(cfg, tag, owners):
+    with owner_cache_lock:
+        cache = read_owner_cache(cfg)
+        cache[f'{tag["spreadsheet"]}:{tag["sheet"]}'] = {'tag': tag, 'owners': owners}
+        tmp_path = cfg.owner_cache_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cfg.owner_cache_file)
+
+def search_jira_user(cfg, auth_jira, name):
+    """
+    Return the account id of the Jira user whose display name or email is `name`,
+    '' when there is no unambiguous match and None when the search itself failed
+    """
+    if isinstance(auth_jira, AsyncJira):
+        JIRAError = JiraHTTPError
+    else:
+        from jira.exceptions import JIRAError
+    try:
+        if isinstance(auth_jira, AsyncJira):
+            users = auth_jira.run(auth_jira.search_users(name))
+        else:
+            users = call_jira(cfg, auth_jira._get_json, 'user/search', params={'query': name})
+    except (JIRAError, JiraHTTPError) as err:
+        print(f'user search for {name!r} failed: {err}')
+        return None
+    # the search is fuzzy, so only an exact display name or email counts, a lone partial hit may be someone else
+    wanted = name.strip().lower()
+    matches = [user for user in users
+               if wanted in ((user.get('displayName') or '').lower(), (user.get('emailAddress') or '').lower())]
+    return matches[0]['accountId'] if len(matches) == 1 else ''
+
+def validate_account_ids(cfg, auth_jira, account_ids):
+    """
+    Return the subset of account_ids that belong to existing Jira users, checking 50 per request
+    """
+    if isinstance(auth_jira, AsyncJira):
+        JIRAError = JiraHTTPError
+    else:
+        from jira.exceptions import JIRAError
+    account_ids = sorted(account_ids)
+    valid = set()
+    for start in range(0, len(account_ids), 50):
+        chunk = account_ids[start:start+50]
+        params = [('accountId', account_id) for account_id in chunk] + [('maxResults', len(chunk))]
+        try:
+            if isinstance(auth_jira, AsyncJira):
+                page = auth_jira.run(auth_jira.bulk_users(chunk))
             else:
-                starting_pos += 1
+                page = call_jira(cfg, auth_jira._get_json, 'user/bulk', params=params)
+        except (JIRAError, JiraHTTPError) as err:
+            # don't block rows on a failed check, Jira will still reject truly bad mentions
+            print(f'account id check failed: {err}')
+            valid.update(chunk)
+            continue
+        valid.update(user['accountId'] for user in page.get('values', []))
+    return valid
+
+class JiraUsers:
+    """
+    Jira user lookups shared by every sheet of a run
+    Name searches, including misses, are kept in USER_SEARCH_CACHE_FILE until their TTL runs out,
+    account ids are checked in bulk once per run
+    """
+    def __init__(self, cfg, search, validate):
+        self.cfg = cfg
+        self.search = search
+        self.validate = validate
+        self.lock = threading.Lock()
+        self.checked = set()
+        self.invalid = set()
+        self.cache = {}
+        if os.path.exists(cfg.user_search_cache_file):
+            try:
+                with open(cfg.user_search_cache_file, encoding='utf-8') as f:
+                    self.cache = json.load(f)
+            except ValueError:
+                pass
+
+    def fresh(self, name, now):
+        entry = self.cache.get(name)
+        if entry is None:
+            return False
+        ttl = self.cfg.user_search_ttl if entry['id'] else self.cfg.user_search_negative_ttl
+        return now - entry['at'] < ttl
+
+    def resolve(self, names):
+        """
+        Return {name: account id} for `names`, searching Jira once for each name missing from the cache
+        """
+        with self.lock:
+            now = time.time()
+            found = {name: self.cache[name]['id'] for name in names if self.fresh(name, now)}
+            missing = [name for name in names if name not in found]
+            if not missing:
+                return found
+
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                account_ids = list(pool.map(self.search, missing))
+            for name, account_id in zip(missing, account_ids):
+                found[name] = account_id or ''
+                if account_id is None:
+                    # failed searches are retried on the next run
+                    continue
+                self.cache[name] = {'id': account_id, 'at': now}
+            tmp_path = self.cfg.user_search_cache_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cfg.user_search_cache_file)
+            return found
+
+    def check(self, account_ids):
+        """
+        Validate in bulk the account ids that haven't been checked yet
+        """
+        with self.lock:
+            account_ids = set(account_ids) - self.checked
+            if not account_ids:
+                return
+            valid = self.validate(account_ids)
+            self.checked |= account_ids
+            self.invalid |= account_ids - valid
+
+class OwnerResolver:
+    """
+    Resolves owner names to Jira account ids, first from the owner sheet, then through JiraUsers
+    Account ids taken from the sheet are checked before the rows using them are submitted
+    """
+    def __init__(self, cfg, directory, users=None):
+        self.cfg = cfg
+        self.directory = directory
+        self.users = users
+        self.found = {}
+
+    def prefetch(self, names):
+        """
+        Look up in one batch every distinct name missing from the sheet
+        """
+        missing = sorted({name for name in names
+                          if name and name not in self.directory and name not in self.found})
+        if not missing:
+            return
+        found = self.users.resolve(missing) if self.users else {}
+        for name in missing:
+            self.found[name] = found.get(name, '')
+            if not self.found[name]:
+                print(f'owner {name!r} is not in the owner sheet' + (' or Jira' if self.users else ''))
+
+    def check_accounts(self, names):
+        """
+        Validate in bulk the sheet account ids of `names`
+        """
+        if self.users is None:
+            return
+        self.users.check({self.directory[name] for name in names if self.directory.get(name)})
+
+    def prefetching(self, chunks):
+        """
+        Pass chunks through, resolving and validating all of their owners in one batch first
+        """
+        for chunk in chunks:
+            with stage('owner lookup'):
+                names = {name for row in chunk for name in (row.tool_owner, row.data_owner)}
+                self.prefetch(names)
+                self.check_accounts(names)
+            yield chunk
+
+    def invalid_mentions(self, row):
+        """
+        Return the owners of row whose sheet account id doesn't exist in Jira
+        """
+        if self.users is None:
+            return []
+        return [name for name in (row.tool_owner, row.data_owner) if self.get(name) in self.users.invalid]
+
+    def get(self, name, default=''):
+        if name in self.directory:
+            return self.directory[name]
+        return self.found.get(name) or default
+
+def iter_sheet_chunks(cfg, sh, title, limiter, chunk_size, first_values=None):
+    """
+    Yield DATA_RANGE as lists of Row, reading chunk_size rows per request
+    A chunk_size of 0 reads the whole range at once
+    first_values are the rows of the first chunk when they were already read along with other ranges
+    """
+    chunk_size = chunk_size or (cfg.last_row - cfg.first_row + 1)
+    for start in range(cfg.first_row, cfg.last_row+1, chunk_size):
+        end = min(start + chunk_size - 1, cfg.last_row)
+        if start == cfg.first_row and first_values is not None:
+            values = first_values
+        else:
+            with stage('sheet read'):
+                values = read_ranges(sh, [f"'{title}'!{start}:{end}"], limiter)[0]
+        # the API leaves out trailing empty rows
+        with stage('parse rows'):
+            rows = [Row.from_record(cfg, start + offset, values[offset] if offset < len(values) else [])
+                    for offset in range(end - start + 1)]
+        yield rows
+
+def rows_from_csv(cfg, lines, chunk_size):
+    """
+    Yield DATA_RANGE as lists of Row from the lines of a worksheet CSV export
+    Lines are parsed as they arrive, keeping only the configured columns, and reading stops after the last row
+    """
+    chunk_size = chunk_size or (cfg.last_row - cfg.first_row + 1)
+    rows = []
+    row = cfg.first_row
+    for number, record in enumerate(csv.reader(lines), 1):
+        if number < cfg.first_row:
+            continue
+        if number > cfg.last_row:
+            break
+        rows.append(Row.from_record(cfg, number, record))
+        row = number + 1
+        if len(rows) == chunk_size:
+            yield rows
+            rows = []
+    # the export leaves out trailing empty rows
+    while row <= cfg.last_row:
+        rows.append(Row.from_record(cfg, row, []))
+        row += 1
+        if len(rows) == chunk_size:
+            yield rows
+            rows = []
+    if rows:
+        yield rows
+
+def columns_from_csv(cfg, indices, lines):
+    """
+    Return {column index: cell values of DATA_RANGE} like columns_from_values(), from the lines of a CSV export
+    """
+    size = cfg.last_row - cfg.first_row + 1
+    columns = {idx: [''] * size for idx in indices}
+    for number, record in enumerate(csv.reader(lines), 1):
+        if number < cfg.first_row:
+            continue
+        if number > cfg.last_row:
+            break
+        width = len(record)
+        for idx in indices:
+            if idx < width:
+                columns[idx][number - cfg.first_row] = record[idx]
+    return columns
+
+@contextlib.contextmanager
+def csv_export(gc, sh, gid):
+    """
+    Stream the CSV export of a worksheet, yielding its decoded lines
+    The export skips the JSON encoding of the values API, which is much cheaper to download and parse for large sheets
+    """
+    url = f'https://docs.google.com/spreadsheets/d/{sh.id}/export'
+    with stage('sheet read'), span('csv export', **{'sheet.gid': gid}):
+        response = gc.session.get(url, params={'format': 'csv', 'gid': gid}, stream=True)
+        response.raise_for_status()
+    response.raw.decode_content = True
+    with response, io.TextIOWrapper(response.raw, encoding='utf-8', newline='') as lines:
+        yield lines
+
+def iter_csv_chunks(cfg, gc, sh, gid, chunk_size):
+    """
+    Yield DATA_RANGE as lists of Row from a single CSV export request of the primary worksheet
+    """
+    with csv_export(gc, sh, gid) as lines:
+        chunks = rows_from_csv(cfg, lines, chunk_size)
+        while True:
+            with stage('parse rows'):
+                rows = next(chunks, None)
+            if rows is None:
+                break
+            yield rows
+
+def iter_column_chunks(cfg, columns, order, chunk_size):
+    """
+    Yield the DATA_RANGE rows at the offsets of `order` as lists of Row, built from an earlier column read
+    """
+    chunk_size = chunk_size or len(order)
+    width = max(columns) + 1
+    for start in range(0, len(order), chunk_size):
+        with stage('parse rows'):
+            rows = []
+            for offset in order[start:start+chunk_size]:
+                record = [''] * width
+                for idx, column in columns.items():
+                    record[idx] = column[offset]
+                rows.append(Row.from_record(cfg, cfg.first_row + offset, record))
+        yield rows
+
+@functools.lru_cache(maxsize=None)
+def parse_date(text):
+    """
+    Return the date written in text, or None when it isn't one
+    Memoized on the raw string, so each distinct value of a sheet is parsed once
+    """
+    from dateutil import parser
+    try:
+        return parser.parse(text, dayfirst=True).date()
+    except (ValueError, OverflowError):
+        return None
+
+@functools.lru_cache(maxsize=None)
+def control_target_dates(cfg):
+    """
+    Return the target date of every control of the description table, in TABLE_FLAG_COLUMNS order
+    """
+    template = build_description(cfg, '', '', '', '', '', (1 << len(cfg.flag_indices)) - 1)
+    return tuple(parse_date(target_date) for _, target_date in control_rows({'description': template}))
+
+@functools.lru_cache(maxsize=4096)
+def target_dates(cfg, dates, today):
+    """
+    Return the target date of every control for the date_cells() of a row, None where there is none
+    A date in the control's TARGET_DATE_COLUMNS cell wins, then its TARGET_DATE_OFFSETS from the row's
+    TARGET_DATE_BASE (or today), then the date written in the description template
+    """
+    from dateutil.relativedelta import relativedelta
+    base, cells = (dates[0], dates[1:]) if dates else ('', ())
+    base = (parse_date(base) if base else None) or today
+    template = control_target_dates(cfg)
+    result = []
+    for bit in range(len(cfg.flag_indices)):
+        value = parse_date(cells[bit]) if bit < len(cells) and cells[bit] else None
+        if value is None and cfg.target_date_offsets and cfg.target_date_offsets[bit]:
+            amount, unit = cfg.target_date_offsets[bit]
+            value = base + relativedelta(**{unit: amount})
+        if value is None and bit < len(template):
+            value = template[bit]
+        result.append(value)
+    return tuple(result)
+
+# PRIORITY_COLUMN words, most urgent first
+CRITICALITY = {'critical': 0, 'highest': 0, 'high': 1, 'medium': 2, 'low': 3, 'lowest': 4}
+
+def schedule_rows(cfg, columns):
+    """
+    Return the DATA_RANGE offsets in the order they are synced, most urgent first
+    PRIORITY=target-date orders by the earliest target date among the row's enabled controls,
+    PRIORITY=column by PRIORITY_COLUMN, either a word of CRITICALITY or a number, lowest first.
+    Rows without a priority keep their sheet order after the others
+    """
+    size = cfg.last_row - cfg.first_row + 1
+    if cfg.priority == 'target-date':
+        today = date.today()
+
+        def key(offset):
+            dates = target_dates(cfg, date_cells(cfg, lambda idx: columns[idx][offset]), today)
+            enabled = [dates[bit] for bit, idx in enumerate(cfg.flag_indices)
+                       if dates[bit] and columns[idx][offset].strip().lower() == 'yes']
+            return (0, min(enabled)) if enabled else (1, 0)
+    else:
+        def key(offset):
+            value = columns[cfg.priority_col][offset].strip()
+            rank = CRITICALITY.get(value.lower())
+            if rank is None:
+                try:
+                    rank = float(value)
+                except ValueError:
+                    return (1, 0)
+            return (0, rank)
+    # sorted() is stable, rows of the same priority stay in sheet order
+    return sorted(range(size), key=key)
+
+def column_ranges(cfg, title):
+    """
+    Return the configured column indices and their DATA_RANGE ranges in A1 notation
+    """
+    indices = {cfg.item_col, cfg.tool_owner_col, cfg.data_owner_col, *cfg.flag_indices}
+    if cfg.epic_col is not None:
+        indices.add(cfg.epic_col)
+    if cfg.issue_key_col is not None:
+        indices.add(cfg.issue_key_col)
+    if cfg.priority_col is not None:
+        indices.add(cfg.priority_col)
+    if cfg.target_date_base_col is not None:
+        indices.add(cfg.target_date_base_col)
+    indices.update(idx for idx in cfg.target_date_cols if idx is not None)
+    indices = sorted(indices)
+    return indices, [f"'{title}'!{col_from_index(idx)}{cfg.first_row}:{col_from_index(idx)}{cfg.last_row}"
+                     for idx in indices]
+
+def columns_from_values(cfg, indices, values):
+    """
+    Return {column index: cell values of DATA_RANGE} from a COLUMNS major read of column_ranges()
+    """
+    size = cfg.last_row - cfg.first_row + 1
+    columns = {}
+    for idx, value_range in zip(indices, values):
+        column = value_range[0] if value_range else []
+        columns[idx] = column + [''] * (size - len(column))
+    return columns
+
+def validate_columns(cfg, columns):
+    """
+    Check DATA_RANGE column by column before anything is written
+    Returns (errors, warnings), errors mean the run must not start
+    """
+    errors, warnings = [], []
+    first = cfg.first_row
+    named = (('ITEM_NAME', cfg.item_col), ('TOOL_OWNER', cfg.tool_owner_col), ('DATA_OWNER', cfg.data_owner_col))
+    stripped = {idx: [value.strip() for value in columns[idx]] for _, idx in named}
+
+    blank = {offset for offset, cells in enumerate(zip(*(columns[idx] for idx in columns)))
+             if not any(cell.strip() for cell in cells)}
+    for offset in sorted(blank):
+        errors.append(f'row {first + offset}: row is empty')
+
+    for name, idx in named:
+        for offset, value in enumerate(stripped[idx]):
+            if not value and offset not in blank:
+                errors.append(f'row {first + offset}: {name} ({col_from_index(idx)}) is empty')
+
+    empty_flags = {}
+    for idx in cfg.flag_indices:
+        col = col_from_index(idx)
+        for offset, value in enumerate(columns[idx]):
+            if value in ('Yes', 'No') or offset in blank:
+                continue
+            normalized = value.strip().lower()
+            if normalized in ('yes', 'no'):
+                warnings.append(f'row {first + offset}: flag {col} reads {value!r}, read as {normalized.capitalize()}')
+            elif normalized:
+                errors.append(f'row {first + offset}: flag {col} reads {value!r}, expected Yes or No')
+            else:
+                empty_flags.setdefault(offset, []).append(col)
+    for offset, cols in sorted(empty_flags.items()):
+        warnings.append(f'row {first + offset}: flags {", ".join(cols)} are empty, read as No')
+
+    if cfg.epic_col is not None:
+        col = col_from_index(cfg.epic_col)
+        for offset, value in enumerate(columns[cfg.epic_col]):
+            project, _, number = value.strip().rpartition('-')
+            if value.strip() and not (project and number.isdigit()):
+                errors.append(f'row {first + offset}: epic {col} reads {value!r}, expected an issue key like ICF-1093')
+
+    date_columns = [('TARGET_DATE_BASE', cfg.target_date_base_col)] + [
+        ('TARGET_DATE_COLUMNS', idx) for idx in cfg.target_date_cols]
+    for name, idx in date_columns:
+        if idx is None:
+            continue
+        for offset, value in enumerate(columns[idx]):
+            if value.strip() and parse_date(value.strip()) is None:
+                errors.append(f'row {first + offset}: {name} ({col_from_index(idx)}) reads {value!r}, expected a date')
+
+    seen = {}
+    for offset, value in enumerate(stripped[cfg.item_col]):
+        if value:
+            seen.setdefault(value.casefold(), []).append(first + offset)
+    for rows in seen.values():
+        if len(rows) > 1:
+            item = stripped[cfg.item_col][rows[0] - first]
+            errors.append(f'item {item!r} appears in rows {", ".join(map(str, rows))}')
+
+    return errors, warnings
+
+# Rough latency of one Sheets or Jira request, used for the wall time estimate
+REQUEST_SECONDS = 0.5
+
+def plan_run(cfg, chunk_size, fetch, check, owners_cached, columns=None):
+    """
+    Return the Sheets and Jira requests a sync is expected to make and its wall time at the configured quotas
+    Without the preflight columns every row counts as pending with every control enabled, an upper bound
+    """
+    size = cfg.last_row - cfg.first_row + 1
+    chunk_size = chunk_size or size
+    if columns is None:
+        pending = range(size)
+        epics = {offset: cfg.jira_epic_key for offset in pending}
+        controls = {offset: len(cfg.flag_indices) for offset in pending}
+        owners = 2 * size
+    else:
+        keys = columns.get(cfg.issue_key_col) or [''] * size
+        pending = [offset for offset in range(size) if not keys[offset].strip()]
+        epic_column = columns.get(cfg.epic_col) or [''] * size
+        epics = {offset: epic_column[offset].strip().upper() or cfg.jira_epic_key for offset in pending}
+        controls = {offset: sum(columns[idx][offset].strip().lower() == 'yes' for idx in cfg.flag_indices)
+                    for offset in pending}
+        owners = len({columns[idx][offset].strip() for offset in pending
+                      for idx in (cfg.tool_owner_col, cfg.data_owner_col)})
+
+    # metadata, then either the column read rows are built from or the row chunks,
+    # the owner sheet riding along with the first read
+    scheduled = cfg.priority != 'sheet'
+    chunk_reads = math.ceil(size / chunk_size) if fetch == 'values' and not (check or scheduled) else 0
+    sheets_reads = 1 + chunk_reads + (1 if (check or scheduled) and fetch == 'values' else 0)
+    # a CSV export carries DATA_RANGE only, the owner sheet takes a values read of its own
+    if fetch == 'csv' and not owners_cached:
+        sheets_reads += 1
+    sheets_writes = 1 if cfg.issue_key_col is not None and pending else 0
+
+    jira_writes = 0
+    groups = {}
+    for offset in pending:
+        group = groups.setdefault((offset // chunk_size, epics[offset]), [0, 0])
+        group[0] += 1
+        group[1] += controls[offset] if cfg.jira_subtask_type else 0
+    for tickets, subtasks in groups.values():
+        jira_writes += math.ceil(tickets / 50) + 1 + math.ceil(subtasks / 50)
+    # the sync backend also looks up the project and every epic, unless JIRA_METADATA_CACHE_FILE still has them
+    jira_reads = math.ceil(owners / 50) + (0 if cfg.jira_backend == 'async' else 1 + len(set(epics.values())))
+
+    paced = [(sheets_reads + sheets_writes + jira_reads + jira_writes) * REQUEST_SECONDS]
+    windows = 1
+    if cfg.sheets_reads_per_minute > 0:
+        paced.append(sheets_reads * 60 / cfg.sheets_reads_per_minute)
+        windows = max(windows, math.ceil(sheets_reads / cfg.sheets_reads_per_minute))
+    if cfg.jira_writes_per_minute > 0:
+        paced.append(jira_writes * 60 / cfg.jira_writes_per_minute)
+        windows = max(windows, math.ceil(jira_writes / cfg.jira_writes_per_minute))
+    return {
+        'rows': len(pending),
+        'exact': columns is not None,
+        'sheets_reads': sheets_reads,
+        'sheets_writes': sheets_writes,
+        'jira_reads': jira_reads,
+        'jira_writes': jira_writes,
+        'seconds': max(paced),
+        'windows': windows,
+        'jira_paced': cfg.jira_writes_per_minute > 0,
+    }
+
+def print_plan(plan):
+    """
+    Print the plan_run() estimate, and how the run is spread out when it doesn't fit in the per-minute quotas
+    """
+    bound = '' if plan['exact'] else 'at most '
+    print(f'plan: {bound}{plan["rows"]} tickets, {plan["sheets_reads"]} Sheets reads, {plan["sheets_writes"]} Sheets writes, '
+          f'{plan["jira_reads"]} Jira reads, {plan["jira_writes"]} Jira writes, about {plan["seconds"]:.0f} s')
+    if plan['windows'] > 1:
+        print(f'plan: over the per-minute quotas, requests are spread over {plan["windows"]} one-minute windows')
+    if plan['jira_writes'] and not plan['jira_paced']:
+        print('plan: Jira writes are not paced (JIRA_WRITES_PER_MINUTE=0), rate limit answers are only retried')
+
+def preflight(cfg, columns):
+    """
+    Validate the whole DATA_RANGE and print the report, returning False when the run must stop
+    """
+    start = time.perf_counter()
+    errors, warnings = validate_columns(cfg, columns)
+    for message in warnings:
+        print(f'warning: {message}')
+    for message in errors:
+        print(f'error: {message}')
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f'checked rows {cfg.first_row}-{cfg.last_row} in {elapsed:.0f} ms: '
+          f'{len(errors)} errors, {len(warnings)} warnings')
+    return not errors
+
+def write_issue_keys(cfg, sh, title, issue_keys):
+    """
+    Write {row: issue key} into ISSUE_KEY_COLUMN with a single batch update
+    """
+    if cfg.issue_key_col is None or not issue_keys:
+        return
+    col = col_from_index(cfg.issue_key_col)
+    with span('values_batch_update', **{'sheet.cells': len(issue_keys)}):
+        sh.values_batch_update(body={
+            'valueInputOption': 'RAW',
+            'data': [{'range': f"'{title}'!{col}{row}", 'values': [[key]]}
+                     for row, key in sorted(issue_keys.items())],
+        })
+    print(f'wrote {len(issue_keys)} issue keys to column {col}')
+
+SUMMARY_SUFFIX = ' - 2021 IT Control Action Plan'
+
+def issue_summary(item_name):
+    return f'{item_name}{SUMMARY_SUFFIX}'
+
+def render_issue(cfg, row, owners):
+    """
+    Return the issue fields for one sheet row
+    """
+    owner_id = owners.get(row.tool_owner, '')
+    data_owner_id = owners.get(row.data_owner, '')
+    template = build_description(cfg, row.item_name, row.tool_owner, owner_id, row.data_owner, data_owner_id, row.flags)
+    dates = target_dates(cfg, row.dates, date.today())
+    set_target_dates(cfg, template, row.flags, dates)
+
+    issue_dict = {
+        'project': cfg.jira_project_key,
+        'summary': issue_summary(row.item_name),
+        'description': template,
+        'issuetype': {'name': cfg.jira_ticket_type}
+    }
+    # the earliest target date of the enabled controls, so tickets can be queried by due date
+    enabled = [value for bit, value in enumerate(dates) if value and row.flags >> bit & 1]
+    if enabled:
+        issue_dict['duedate'] = min(enabled).isoformat()
+    return issue_dict
+
+def set_target_dates(cfg, template, flags, dates):
+    """
+    Write the target dates that differ from the template into the control table of a description
+    """
+    template_dates = control_target_dates(cfg)
+    table_rows = iter(template['content'][-1]['content'][1:])
+    for bit in range(len(cfg.flag_indices)):
+        if not flags >> bit & 1:
+            continue
+        table_row = next(table_rows)
+        if dates[bit] and (bit >= len(template_dates) or dates[bit] != template_dates[bit]):
+            table_row['content'][1]['content'][0]['content'][0]['text'] = dates[bit].strftime('%d %b %y')
+
+def plan_batches(cfg, rows):
+    """
+    Group rows by target epic, keeping the order they come in, sheet order or the PRIORITY order
+    Returns {epic key: [Row]}, so every epic gets bulk creates and a single link request
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.epic_key, []).append(row)
+    return groups
+
+def control_rows(issue_dict):
+    """
+    Return (control url, target date) of every row left in the control table of a rendered ticket
+    """
+    table = issue_dict['description']['content'][-1]
+    controls = []
+    for table_row in table['content'][1:]:
+        control_cell, date_cell = table_row['content'][:2]
+        controls.append((control_cell['content'][0]['content'][0]['attrs']['url'],
+                         date_cell['content'][0]['content'][0]['text']))
+    return controls
 
-        issue_dict = {
-            'project': os.getenv('JIRA_PROJECT_KEY'),
-            'summary': f'{item_name} - 2021 IT Control Action Plan',
-            'description': template,
-            'issuetype': {'name': os.getenv('JIRA_TICKET_TYPE')}
+def render_subtasks(cfg, issue_dict, parent_key):
+    """
+    Return the fields of one sub-task of parent_key per enabled control
+    """
+    item_name = issue_dict['summary'].rsplit(' - ', 1)[0]
+    subtasks = []
+    for url, target_date in control_rows(issue_dict):
+        control = url.rstrip('/').rsplit('/', 1)[-1]
+        subtask = {
+            'project': issue_dict['project'],
+            'parent': {'key': parent_key},
+            'summary': f'{item_name} - {control}',
+            'issuetype': {'name': cfg.jira_subtask_type},
+            'description': {
+                'type': 'doc',
+                'version': 1,
+                'content': [
+                    {'type': 'paragraph', 'content': [
+                        {'type': 'text', 'text': 'Control: ', 'marks': [{'type': 'strong'}]},
+                        {'type': 'inlineCard', 'attrs': {'url': url}},
+                    ]},
+                    {'type': 'paragraph', 'content': [
+                        {'type': 'text', 'text': 'Target date: ', 'marks': [{'type': 'strong'}]},
+                        {'type': 'text', 'text': target_date},
+                    ]},
+                ]
+            },
         }
+        due = parse_date(target_date)
+        if due:
+            subtask['duedate'] = due.isoformat()
+        subtasks.append(subtask)
+    return subtasks
+
+class InvalidDocument(ValueError):
+    """
+    A rendered description Jira would reject, found before sending it
+    """
+
+# The part of the Atlassian Document Format the templates use:
+# node type -> (allowed child types or None for leaves, required non-empty attrs, content must not be empty)
+ADF_SCHEMA = {
+    'doc': ({'paragraph', 'table'}, (), True),
+    'paragraph': ({'text', 'mention', 'inlineCard', 'hardBreak'}, (), False),
+    'table': ({'tableRow'}, (), True),
+    'tableRow': ({'tableHeader', 'tableCell'}, (), True),
+    'tableHeader': ({'paragraph'}, (), True),
+    'tableCell': ({'paragraph'}, (), True),
+    'text': (None, (), False),
+    'mention': (None, ('id',), False),
+    'inlineCard': (None, ('url',), False),
+    'hardBreak': (None, (), False),
+}
+ADF_MARKS = {'strong', 'em', 'code', 'strike', 'underline'}
+
+def validate_adf(node, path='doc'):
+    """
+    Return the problems Jira would reject in an ADF node and its children, [] when it is valid
+    """
+    kind = node.get('type')
+    if kind not in ADF_SCHEMA:
+        return [f'{path}: unknown node type {kind!r}']
+    children, required, needs_content = ADF_SCHEMA[kind]
+    errors = []
+    attrs = node.get('attrs') or {}
+    for name in required:
+        if not attrs.get(name):
+            errors.append(f'{path}: {kind} needs a non-empty {name}')
+    if kind == 'inlineCard' and attrs.get('url'):
+        url = urlsplit(attrs['url'])
+        if url.scheme not in ('http', 'https') or not url.netloc:
+            errors.append(f'{path}: inlineCard url {attrs["url"]!r} is not an http(s) URL')
+    if kind == 'text':
+        if not node.get('text'):
+            errors.append(f'{path}: text must not be empty')
+        for mark in node.get('marks', []):
+            if mark.get('type') not in ADF_MARKS:
+                errors.append(f'{path}: unknown mark {mark.get("type")!r}')
+    content = node.get('content') or []
+    if children is None and content:
+        errors.append(f'{path}: {kind} can\'t have content')
+    elif needs_content and not content:
+        errors.append(f'{path}: {kind} needs content')
+    for idx, child in enumerate(content if children is not None else []):
+        if child.get('type') not in children:
+            errors.append(f'{path}/{idx}: {child.get("type")!r} is not allowed in {kind}')
+        else:
+            errors += validate_adf(child, f'{path}/{idx}')
+    return errors
+
+@functools.lru_cache(maxsize=None)
+def description_shape_errors(cfg, flags):
+    """
+    Validate the description template once per control set, with placeholders in the per-row slots
+    """
+    return tuple(validate_adf(build_description(cfg, 'item', 'owner', 'id', 'owner', 'id', flags)))
+
+def check_description(cfg, row, owners):
+    """
+    Return the problems of the description of a row, checking only its variable slots
+    once the shape of its control set has been validated
+    """
+    problems = list(description_shape_errors(cfg, row.flags))
+    if not row.item_name:
+        problems.append('ITEM_NAME is empty, Jira rejects empty text')
+    for name, owner in (('TOOL_OWNER', row.tool_owner), ('DATA_OWNER', row.data_owner)):
+        if not owners.get(owner, ''):
+            problems.append(f'{name} {owner!r} has no Jira account id, Jira rejects the empty mention')
+    return problems
+
+def sync_rows(cfg, chunks, owners, submit, reject=None):
+    """
+    Push each chunk of rows through planning, rendering and submission, then let it go
+    submit receives an epic key and the [(row number, issue fields)] of the chunk going to it,
+    reject the row number, issue fields, InvalidDocument and epic key of rows Jira would refuse.
+    Nothing is kept between chunks, so memory stays flat however long the sheet is
+    """
+    count = 0
+    for chunk in chunks:
+        pending = []
+        for row in chunk:
+            if row.issue_key:
+                # ticket was created by an earlier run
+                continue
+            invalid = owners.invalid_mentions(row)
+            if invalid:
+                print(f'row {row.row}: no Jira account behind the id of {", ".join(invalid)}')
+                if cfg.invalid_mentions == 'block':
+                    continue
+            pending.append(row)
+        with stage('plan'):
+            groups = plan_batches(cfg, pending)
+        for epic_key, rows in groups.items():
+            batch = []
+            for row in rows:
+                with stage('render'):
+                    issue_dict = render_issue(cfg, row, owners)
+                with stage('validate'):
+                    problems = check_description(cfg, row, owners)
+                if problems:
+                    err = InvalidDocument('; '.join(problems))
+                    if reject:
+                        reject(row.row, issue_dict, err, epic_key)
+                    else:
+                        print(f'row {row.row}: {err}')
+                    continue
+                batch.append((row.row, issue_dict))
+            if batch:
+                with stage('jira submit'):
+                    submit(epic_key, batch)
+            count += len(batch)
+    return count
+
+class JiraHTTPError(Exception):
+    """
+    Error response from AsyncJira, with the same status_code and text attributes as JIRAError
+    """
+    def __init__(self, status_code, text, url, attempts=1):
+        super().__init__(f'HTTP {status_code} {url}: {text[:500]}')
+        self.status_code = status_code
+        self.text = text
+        self.url = url
+        self.attempts = attempts
+
+def rest_fields(issue_dict):
+    """
+    Return issue fields in the shape the REST API expects, the jira library does this itself
+    """
+    fields = dict(issue_dict)
+    for name in ('project', 'issuetype', 'parent'):
+        if isinstance(fields.get(name), str):
+            fields[name] = {'name': fields[name]} if name == 'issuetype' else {'key': fields[name]}
+    return fields
+
+class AsyncJira:
+    """
+    Lean asyncio Jira REST client for bulk create, epic linking, search, bulk transitions and user lookup
+    All requests share one pooled aiohttp session, at most JIRA_CONCURRENCY in flight.
+    The event loop runs in a background thread, synchronous code calls in through run().
+    """
+    def __init__(self, cfg, limiter=None):
+        # imported here like aiohttp, so the sync backend and --help don't pay for loading asyncio
+        import asyncio, aiohttp
+        self.asyncio = asyncio
+        self.aiohttp = aiohttp
+        self.cfg = cfg
+        self.limiter = limiter
+        self.base = cfg.jira_server_url.rstrip('/')
+        self.loop = self.asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.session = self.run(self.open_session())
+
+    async def open_session(self):
+        return self.aiohttp.ClientSession(
+            auth=self.aiohttp.BasicAuth(self.cfg.jira_username, self.cfg.jira_token),
+            connector=self.aiohttp.TCPConnector(limit=self.cfg.jira_concurrency),
+            headers={'Accept': 'application/json'},
+        )
+
+    def run(self, coro):
+        return self.asyncio.run_coroutine_threadsafe(coro, self.loop).result()
 
+    def close(self):
+        self.run(self.session.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    async def request(self, method, path, rows=None, write=False, **kwargs):
+        """
+        Send one request, retrying on rate limit and server errors like call_jira()
+        Writes wait for their slot of JIRA_WRITES_PER_MINUTE first
+        """
+        if write and self.limiter:
+            await self.loop.run_in_executor(None, self.limiter.wait)
+        url = f'{self.base}{path}'
+        start = time.time_ns()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    status = response.status
+                    text = await response.text()
+                    retry_after = response.headers.get('Retry-After')
+            except self.aiohttp.ClientError as err:
+                status, text, retry_after = None, str(err), None
+            retriable = status is None or status == 429 or status >= 500
+            if not retriable or attempt >= self.cfg.jira_max_attempts:
+                break
+            await self.asyncio.sleep(float(retry_after) if retry_after else 2 ** attempt)
+
+        if tracer is not None:
+            attributes = {'http.method': method, 'url.path': path, 'retry.attempts': attempt}
+            if status:
+                attributes['http.status_code'] = status
+            if rows:
+                attributes['sheet.rows'] = list(rows)
+            error = JiraHTTPError(status, text, url, attempt) if not status or status >= 400 else None
+            tracer.add(f'{method} {path.split("?")[0]}', os.urandom(8).hex(), tracer.root_id,
+                       start, time.time_ns(), attributes, error)
+        if not status or status >= 400:
+            raise JiraHTTPError(status, text, url, attempt)
+        return json.loads(text) if text else None
+
+    async def create_many(self, batch):
+        """
+        Create the [(row, fields)] of batch as concurrent bulk requests of 50,
+        returning a key or JiraHTTPError for each row
+        """
+        async def create(part):
+            try:
+                results = await self.create_issues([fields for _, fields in part], [row for row, _ in part])
+            except JiraHTTPError as err:
+                return [err] * len(part)
+            return [result if isinstance(result, str) else
+                    JiraHTTPError(400, json.dumps(result), f'{self.base}/rest/api/3/issue/bulk')
+                    for result in results]
+        parts = await self.asyncio.gather(*(create(batch[start:start+50]) for start in range(0, len(batch), 50)))
+        return [result for part in parts for result in part]
+
+    async def create_issues(self, field_list, rows=None):
+        """
+        Bulk create up to 50 issues in one request
+        Returns a key or the error of each issue, in the order of field_list
+        """
+        payload = {'issueUpdates': [{'fields': rest_fields(fields)} for fields in field_list]}
+        url = f'{self.base}/rest/api/3/issue/bulk'
         try:
-            # Open JIRA
-            auth_jira = JIRA(
-                options={'server': jira_server_url, 'rest_api_version': 3},
-                basic_auth=(os.getenv('JIRA_USERNAME'), os.getenv('JIRA_OAUTH_TOKEN'))
-            )
-            issue_key = str(auth_jira.create_issue(fields=issue_dict))
-            epic = auth_jira.issue(os.getenv('JIRA_EPIC_KEY'))
-            auth_jira.add_issues_to_epic(epic.id, [issue_key])
-            print(f'create new ticket {issue_key}')
-            
-        except JIRAError as err:
+            result = await self.request('POST', '/rest/api/3/issue/bulk', rows=rows, write=True, json=payload)
+            status, text = 201, None
+        except JiraHTTPError as err:
+            # a 400 means none of them were created, the body still lists the errors
+            if err.status_code != 400:
+                raise
+            status, text = err.status_code, err.text
+            try:
+                result = json.loads(err.text)
+            except ValueError:
+                raise err
+        issues = result.get('issues', []) if isinstance(result, dict) else None
+        element_errors = result.get('errors', []) if isinstance(result, dict) else None
+        # a request-level 400 has no error per issue, so the whole part fails instead of being matched up
+        if (not isinstance(issues, list) or not isinstance(element_errors, list)
+                or not all(isinstance(error, dict) and 'failedElementNumber' in error for error in element_errors)
+                or len(issues) + len(element_errors) != len(field_list)):
+            raise JiraHTTPError(status, text or json.dumps(result), url)
+        errors = {error['failedElementNumber']: error.get('elementErrors') for error in element_errors}
+        created = iter(issues)
+        return [errors[index] if index in errors else next(created)['key'] for index in range(len(field_list))]
+
+    async def add_issues_to_epic(self, epic_key, issue_keys, rows=None):
+        """
+        Link issues to an epic through the Agile API, 50 per request
+        rows are the sheet rows of issue_keys, recorded on the spans
+        """
+        for start in range(0, len(issue_keys), 50):
+            await self.request('POST', f'/rest/agile/1.0/epic/{epic_key}/issue', write=True,
+                               rows=rows[start:start+50] if rows else None, json={'issues': issue_keys[start:start+50]})
+
+    async def search_issues(self, jql, fields=('summary',), next_page_token=None, max_results=100, expand=''):
+        """
+        Return one page of a JQL search, the next one is asked for with the page's nextPageToken
+        """
+        payload = {'jql': jql, 'maxResults': max_results, 'fields': list(fields), 'expand': expand}
+        if next_page_token:
+            payload['nextPageToken'] = next_page_token
+        return await self.request('POST', '/rest/api/3/search/jql', json=payload)
+
+    async def bulk_transition(self, transition_id, issue_keys):
+        """
+        Queue one transition of up to 1000 issues and return the id of the bulk task
+        """
+        result = await self.request('POST', '/rest/api/3/bulk/issues/transition', write=True, json={
+            'bulkTransitionInputs': [{'selectedIssueIdsOrKeys': issue_keys, 'transitionId': transition_id}],
+            'sendBulkNotification': False,
+        })
+        return result['taskId']
+
+    async def bulk_task(self, task_id):
+        return await self.request('GET', f'/rest/api/3/bulk/queue/{task_id}')
+
+    async def search_users(self, query):
+        return await self.request('GET', '/rest/api/3/user/search', params={'query': query})
+
+    async def bulk_users(self, account_ids):
+        params = [('accountId', account_id) for account_id in account_ids] + [('maxResults', len(account_ids))]
+        return await self.request('GET', '/rest/api/3/user/bulk', params=params)
+
+class Clients:
+    """
+    Backend clients shared by every sheet of a run, created on first use
+    One gspread client, one Jira session, one Sheets rate limiter and one Jira user cache
+    """
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.lock = threading.Lock()
+        self.limiter = RateLimiter(cfg.sheets_reads_per_minute)
+        self.jira_limiter = RateLimiter(cfg.jira_writes_per_minute)
+        self._gc = None
+        self._jira = None
+        self._users = None
+        self._async_jira = None
+        self.epics = {}
+        self.spreadsheets = {}
+
+    def gspread(self):
+        with self.lock:
+            if self._gc is None:
+                self._gc = connect_gspread()
+            return self._gc
+
+    def spreadsheet(self, name):
+        gc = self.gspread()
+        with self.lock:
+            if name not in self.spreadsheets:
+                with span('open spreadsheet'):
+                    self.spreadsheets[name] = gc.open(name)
+            return self.spreadsheets[name]
+
+    def jira(self):
+        with self.lock:
+            if self._jira is None:
+                self._jira = connect_jira(self.cfg)
+            return self._jira
+
+    def async_jira(self):
+        """
+        Return the AsyncJira client when JIRA_BACKEND is async and aiohttp is installed, None otherwise
+        """
+        if self.cfg.jira_backend != 'async':
+            return None
+        with self.lock:
+            if self._async_jira is None:
+                try:
+                    self._async_jira = AsyncJira(self.cfg, self.jira_limiter)
+                except ImportError:
+                    print('JIRA_BACKEND=async needs aiohttp (pip install aiohttp), using the jira library instead')
+                    self._async_jira = False
+            return self._async_jira or None
+
+    def users(self):
+        async_jira = self.async_jira()
+        if async_jira:
+            search = lambda name: search_jira_user(self.cfg, async_jira, name)
+            validate = lambda account_ids: validate_account_ids(self.cfg, async_jira, account_ids)
+        else:
+            auth_jira = self.jira()
+            search = lambda name: search_jira_user(self.cfg, auth_jira, name)
+            validate = lambda account_ids: validate_account_ids(self.cfg, auth_jira, account_ids)
+        with self.lock:
+            if self._users is None:
+                # Owners missing from the sheet fall back to a Jira user search
+                self._users = JiraUsers(self.cfg, search, validate)
+            return self._users
+
+    def close(self):
+        if self._async_jira:
+            self._async_jira.close()
+            self._async_jira = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def epic(self, key):
+        auth_jira = self.jira()
+        with self.lock:
+            if key not in self.epics:
+                self.epics[key] = jira_metadata(self.cfg, auth_jira, f'issue/{key}', {'fields': 'summary,issuetype'})
+            return self.epics[key]
+
+# Every target of a manifest runs on the Jira client and rate limiters of the first one
+SHARED_SETTINGS = ('JIRA_SERVER_URL', 'JIRA_USERNAME', 'JIRA_OAUTH_TOKEN', 'JIRA_BACKEND', 'JIRA_CONCURRENCY',
+                   'JIRA_MAX_ATTEMPTS', 'SHEETS_READS_PER_MINUTE', 'JIRA_WRITES_PER_MINUTE')
+
+def load_manifest(path, env=os.environ, dead_letter=None):
+    """
+    Return [(name, Config)] for every target of a run manifest
+    Each target is a JSON object overriding settings of the environment, for example
+    {"targets": [{"name": "controls", "SHEET_NAME": "IT Controls Latest", "DATA_RANGE": "7:168", "JIRA_EPIC_KEY": "ICF-1093"}]}
+    Targets without DEAD_LETTER_FILE get dead_letter.<name>.jsonl, or <name> inserted into `dead_letter`
+    """
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    root, ext = os.path.splitext(dead_letter or 'dead_letter.jsonl')
+    targets = []
+    errors = []
+    for number, target in enumerate(manifest.get('targets', []), 1):
+        name = str(target.get('name') or f'target-{number}')
+        shared = [key for key in SHARED_SETTINGS if key in target]
+        if shared:
+            errors.append(f'{name}: {", ".join(shared)} must be the same for every target, set it in .env instead')
+            continue
+        settings = dict(env)
+        settings['DEAD_LETTER_FILE'] = f'{root}.{name}{ext}'
+        settings.update({key: str(value) for key, value in target.items() if key != 'name'})
+        try:
+            targets.append((name, load_config(settings)))
+        except ConfigError as err:
+            errors.append(f'{name}: {err}')
+    if errors:
+        raise ConfigError('\n'.join(errors))
+    if not targets:
+        raise ConfigError(f'{path} lists no targets')
+    return targets
+
+def sync_manifest(targets, clients, revisions=None, **options):
+    """
+    Sync every target concurrently, sharing `clients`
+    The run takes about as long as its slowest sheet. revisions receives, for each target that synced,
+    the spreadsheet revision its rows were read at, moved past the run's own issue key write-back
+    """
+    def run(target):
+        name, cfg = target
+        revision = sync(cfg, cfg.dead_letter_file, clients=clients, **options)
+        if revisions is not None:
+            revisions[name] = revision
+        return name
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        futures = {pool.submit(run, target): target[0] for target in targets}
+        for future in futures:
+            name = futures[future]
+            try:
+                future.result()
+                print(f'[{name}] done')
+            except (Exception, SystemExit) as err:
+                failed.append(name)
+                print(f'[{name}] failed: {err}')
+    if failed:
+        raise SystemExit(f'{len(failed)} of {len(targets)} targets failed: {", ".join(failed)}')
+
+def watch(targets, clients, **options):
+    """
+    Keep the clients warm and sync a target only when its spreadsheet revision changes
+    Polling backs off towards WATCH_MAX_INTERVAL while nothing changes and resets after a change
+    """
+    cfg = targets[0][1]
+    missing = [name for name, target_cfg in targets if target_cfg.issue_key_col is None]
+    if missing:
+        raise SystemExit(f'watch needs ISSUE_KEY_COLUMN so rows are only synced once, missing for: {", ".join(missing)}')
+
+    gc = clients.gspread()
+    revisions = {}
+    interval = cfg.watch_min_interval
+    try:
+        while True:
+            changed = []
+            try:
+                for name, target_cfg in targets:
+                    sh = clients.spreadsheet(target_cfg.sheet_name)
+                    if revisions.get(name) != sheet_revision(gc, sh.id):
+                        changed.append((name, target_cfg))
+            except Exception as err:
+                # a Drive or network hiccup must not end the watch, try again after a longer pause
+                print(f'{datetime.now():%H:%M:%S} poll failed: {err}')
+                interval = min(interval * 1.5, cfg.watch_max_interval)
+                time.sleep(interval)
+                continue
+
+            if changed:
+                print(f'{datetime.now():%H:%M:%S} change detected in {", ".join(name for name, _ in changed)}')
+                # the baseline is the revision each sync read its rows at, so an edit made while it ran
+                # is picked up by the next poll. Failed targets keep their old baseline and are retried
+                try:
+                    sync_manifest(changed, clients, revisions, **options)
+                except SystemExit as err:
+                    print(err)
+                interval = cfg.watch_min_interval
+            else:
+                interval = min(interval * 1.5, cfg.watch_max_interval)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print('watch stopped')
+
+def validate_sheet(cfg):
+    sh = connect_gspread().open(cfg.sheet_name)
+    limiter = RateLimiter(cfg.sheets_reads_per_minute)
+    primary, _ = worksheet_titles(cfg, sh)
+    indices, ranges = column_ranges(cfg, primary)
+    if not preflight(cfg, columns_from_values(cfg, indices, read_ranges(sh, ranges, limiter, 'COLUMNS'))):
+        raise SystemExit(1)
+
+def sync(cfg, dead_letter_path, dry_run=False, chunk_size=None, fetch=None, refresh_owners=False, check=True,
+         clients=None):
+    """
+    Create the tickets of the pending rows of one sheet
+    Returns the spreadsheet revision the rows were read at, or the one after the issue key write-back
+    when nobody else edited the spreadsheet in between
+    """
+    # a broken template (e.g. an empty DOC_URL) fails every row the same way, so stop before reading anything
+    shape_errors = description_shape_errors(cfg, (1 << len(cfg.flag_indices)) - 1)
+    if shape_errors:
+        raise SystemExit(f'the description template is invalid, nothing was written: {"; ".join(shape_errors)}')
+    clients = clients or Clients(cfg)
+
+    # Open Google Sheet
+    gc = clients.gspread()
+    with stage('sheet metadata'):
+        sh = clients.spreadsheet(cfg.sheet_name)
+        primary_properties, secondary_properties = worksheet_properties(cfg, sh)
+    primary, secondary = primary_properties['title'], secondary_properties['title']
+    # Google Sheets limits read requests per minute, so reads are spaced out instead of failing on quota
+    limiter = clients.limiter
+    chunk_size = cfg.chunk_size if chunk_size is None else chunk_size
+    fetch = fetch or cfg.sheet_fetch
+
+    with stage('sheet metadata'):
+        tag = owner_cache_tag(cfg, gc, sh)
+    directory = None if refresh_owners else load_owner_cache(cfg, tag)
+    # A stale owner directory is read in the same request as the first sheet values
+    owner_ranges = [f"'{secondary}'"] if directory is None else []
+    first_values = columns = None
+    scheduled = cfg.priority != 'sheet'
+    if (check or scheduled) and fetch == 'csv':
+        # the configured columns come out of the one CSV export, the values API only reads the owner sheet
+        indices, _ = column_ranges(cfg, primary)
+        if owner_ranges:
+            with stage('sheet read'):
+                owner_rows = read_ranges(sh, owner_ranges, limiter)[0]
+        with csv_export(gc, sh, primary_properties['sheetId']) as lines, stage('parse rows'):
+            columns = columns_from_csv(cfg, indices, lines)
+    elif check or scheduled:
+        indices, ranges = column_ranges(cfg, primary)
+        with stage('sheet read'):
+            values = read_ranges(sh, ranges + owner_ranges, limiter, 'COLUMNS')
+        if owner_ranges:
+            owner_columns = values.pop()
+            owner_rows = [list(row) for row in itertools.zip_longest(*owner_columns, fillvalue='')]
+        columns = columns_from_values(cfg, indices, values)
+    elif fetch == 'csv':
+        if owner_ranges:
+            with stage('sheet read'):
+                owner_rows = read_ranges(sh, owner_ranges, limiter)[0]
+    else:
+        first_end = cfg.last_row if not chunk_size else min(cfg.first_row + chunk_size - 1, cfg.last_row)
+        with stage('sheet read'):
+            values = read_ranges(sh, [f"'{primary}'!{cfg.first_row}:{first_end}"] + owner_ranges, limiter)
+        if owner_ranges:
+            owner_rows = values.pop()
+        first_values = values[0]
+    if check:
+        with stage('preflight'):
+            passed = preflight(cfg, columns)
+        if not passed:
+            raise SystemExit('sheet validation failed, nothing was written (use --no-preflight to skip the check)')
+    if directory is None:
+        with stage('owner directory'):
+            directory = load_owner_directory(cfg, owner_rows)
+            save_owner_cache(cfg, tag, directory)
+
+    print_plan(plan_run(cfg, chunk_size, fetch, check, not owner_ranges, columns))
+
+    if scheduled:
+        # the column read already holds every configured cell, so rows come from it in priority order
+        with stage('schedule'):
+            order = schedule_rows(cfg, columns)
+        chunks = iter_column_chunks(cfg, columns, order, chunk_size)
+    elif columns is not None:
+        # the rows are built from the values preflight just checked instead of being read again
+        chunks = iter_column_chunks(cfg, columns, range(cfg.last_row - cfg.first_row + 1), chunk_size)
+    elif fetch == 'csv':
+        chunks = iter_csv_chunks(cfg, gc, sh, primary_properties['sheetId'], chunk_size)
+    else:
+        chunks = iter_sheet_chunks(cfg, sh, primary, limiter, chunk_size, first_values)
+
+    if dry_run:
+        def submit(epic_key, batch):
+            for row, issue_dict in batch:
+                subtasks = f' with {len(control_rows(issue_dict))} sub-tasks' if cfg.jira_subtask_type else ''
+                print(f'row {row}: would create "{issue_dict["summary"]}" in {epic_key}{subtasks}')
+        owners = OwnerResolver(cfg, directory)
+        sync_rows(cfg, owners.prefetching(chunks), owners, submit)
+        return tag['revision']
+
+    def reject(row, issue_dict, err, epic_key):
+        # never sent, Jira would answer 400
+        print(f'row {row}: {err}')
+        dead_letter(dead_letter_path, row, 'create', issue_dict, err, attempts=0, epic_key=epic_key)
+
+    issue_keys = {}
+    owners = OwnerResolver(cfg, directory, clients.users())
+    async_jira = clients.async_jira()
+
+    if async_jira:
+        errors = JiraHTTPError
+        create_bulk = lambda batch: async_jira.run(async_jira.create_many(batch))
+        link = lambda epic_key, issue_keys, rows: async_jira.run(async_jira.add_issues_to_epic(epic_key, issue_keys, rows))
+    else:
+        from jira.exceptions import JIRAError as errors
+
+        def create_bulk(batch):
+            # Jira accepts at most 50 issues per bulk create request
+            auth_jira = clients.jira()
+            results = []
+            for start in range(0, len(batch), 50):
+                part = batch[start:start+50]
+                clients.jira_limiter.wait()
+                try:
+                    # project and issue type are passed as keys, so the bulk create does no lookups of its own
+                    with rows_context(row for row, _ in part):
+                        created = call_jira(cfg, auth_jira.create_issues,
+                                            field_list=[rest_fields(fields) for _, fields in part], prefetch=False)
+                except errors as err:
+                    results += [err] * len(part)
+                    continue
+                results += [result['issue'].key if result['status'] == 'Success' else
+                            errors(text=json.dumps(result['error'])) for result in created]
+            return results
+
+        def link(epic_key, issue_keys, rows):
+            clients.jira_limiter.wait()
+            epic_id = clients.epic(epic_key)['id']
+            with rows_context(rows):
+                call_jira(cfg, clients.jira().add_issues_to_epic, epic_id, issue_keys)
+
+    def submit(epic_key, batch):
+        created = []
+        for (row, issue_dict), result in zip(batch, create_bulk(batch)):
+            if isinstance(result, errors):
+                print(str(result))
+                dead_letter(dead_letter_path, row, 'create', issue_dict, result, epic_key=epic_key)
+                continue
+            issue_keys[row] = result
+            created.append((row, issue_dict, result))
+        if not created:
+            return
+
+        try:
+            link(epic_key, [issue_key for _, _, issue_key in created], [row for row, _, _ in created])
+            for _, _, issue_key in created:
+                print(f'create new ticket {issue_key}')
+        except errors as err:
             print(str(err))
+            for row, issue_dict, issue_key in created:
+                dead_letter(dead_letter_path, row, 'link', issue_dict, err, issue_key=issue_key, epic_key=epic_key)
+
+        if cfg.jira_subtask_type:
+            # the sub-tasks of every parent in the batch go out together, 50 per bulk request
+            subtasks = [(row, fields) for row, issue_dict, issue_key in created
+                        for fields in render_subtasks(cfg, issue_dict, issue_key)]
+            failed = 0
+            for (row, fields), result in zip(subtasks, create_bulk(subtasks)):
+                if isinstance(result, errors):
+                    print(str(result))
+                    dead_letter(dead_letter_path, row, 'subtask', fields, result)
+                    failed += 1
+            print(f'create {len(subtasks) - failed} sub-tasks')
+
+    if not async_jira:
+        with stage('jira connect'):
+            check_issue_types(cfg, clients.jira())
+            clients.epic(cfg.jira_epic_key)
+    try:
+        sync_rows(cfg, owners.prefetching(chunks), owners, submit, reject)
+    finally:
+        # also on failure, so a rerun doesn't create the same tickets again
+        with stage('write back'):
+            # the write-back bumps the revision the owner cache is keyed on, so when nobody else edited
+            # the spreadsheet during the run the directory is saved again under the new revision.
+            # That is only a cache refresh, a failed Drive call must never cost the issue keys
+            revision = tag['revision']
+            unchanged = False
+            if cfg.issue_key_col is not None and issue_keys:
+                try:
+                    unchanged = sheet_revision(gc, sh.id) == tag['revision']
+                except Exception as err:
+                    print(f'revision check failed, the owner cache is not refreshed: {err}')
+            write_issue_keys(cfg, sh, primary, issue_keys)
+            if unchanged:
+                try:
+                    new_tag = owner_cache_tag(cfg, gc, sh)
+                    save_owner_cache(cfg, new_tag, directory)
+                    revision = new_tag['revision']
+                except Exception as err:
+                    print(f'owner cache refresh failed: {err}')
+    return revision
+
+def epic_children(cfg, auth_jira, epic_key, issue_types, page_size=100):
+    """
+    Yield the tickets this script created under an epic one search page at a time,
+    with summary, status and available transitions
+    The JQL doesn't filter on status, so transitions made between pages don't shift the later pages
+    """
+    types = ', '.join(json.dumps(issue_type) for issue_type in sorted(issue_types))
+    jql = (f'parent = {epic_key} AND issuetype in ({types}) '
+           f'AND summary ~ {json.dumps(SUMMARY_SUFFIX.strip(" -"))} ORDER BY key')
+    token = None
+    while True:
+        if isinstance(auth_jira, AsyncJira):
+            page = auth_jira.run(auth_jira.search_issues(jql, ('summary', 'status'), token, page_size, 'transitions'))
+        else:
+            params = {'jql': jql, 'maxResults': page_size, 'fields': 'summary,status', 'expand': 'transitions'}
+            if token:
+                params['nextPageToken'] = token
+            page = call_jira(cfg, auth_jira._get_json, 'search/jql', params=params)
+        issues = page.get('issues', [])
+        if issues:
+            yield issues
+        # the enhanced search has no total, the last page comes without a token
+        token = page.get('nextPageToken')
+        if not issues or not token or page.get('isLast'):
+            return
+
+def transition_issues(cfg, auth_jira, limiter, transition_id, issue_keys):
+    """
+    Transition issue_keys through one Jira bulk operation, waiting for it to finish
+    Returns {issue id: [errors]} of the issues Jira could not transition
+    """
+    limiter.wait()
+    if isinstance(auth_jira, AsyncJira):
+        task_id = auth_jira.run(auth_jira.bulk_transition(transition_id, issue_keys))
+        poll = lambda: auth_jira.run(auth_jira.bulk_task(task_id))
+    else:
+        payload = {
+            'bulkTransitionInputs': [{'selectedIssueIdsOrKeys': issue_keys, 'transitionId': transition_id}],
+            'sendBulkNotification': False,
+        }
+        response = call_jira(cfg, auth_jira._session.post, auth_jira._get_url('bulk/issues/transition'),
+                             data=json.dumps(payload))
+        task_id = response.json()['taskId']
+        poll = lambda: call_jira(cfg, auth_jira._get_json, f'bulk/queue/{task_id}')
+    while True:
+        task = poll()
+        if task['status'] not in ('ENQUEUED', 'RUNNING', 'CANCEL_REQUESTED'):
+            break
+        time.sleep(2)
+    if task['status'] != 'COMPLETE':
+        return {key: [f'bulk task {task_id} ended {task["status"]}'] for key in issue_keys}
+    return task.get('failedAccessibleIssues') or {}
+
+def reconcile_keep(cfg, clients):
+    """
+    Return the summaries the rows of a target still stand for, {epic key: summaries},
+    and the issue keys they store, which keep their ticket whatever epic it is in
+    """
+    sh = clients.spreadsheet(cfg.sheet_name)
+    primary, _ = worksheet_titles(cfg, sh)
+    indices = sorted({cfg.item_col} | {idx for idx in (cfg.issue_key_col, cfg.epic_col) if idx is not None})
+    ranges = [f"'{primary}'!{col_from_index(idx)}{cfg.first_row}:{col_from_index(idx)}{cfg.last_row}" for idx in indices]
+    with stage('sheet read'):
+        columns = columns_from_values(cfg, indices, read_ranges(sh, ranges, clients.limiter, 'COLUMNS'))
+    size = cfg.last_row - cfg.first_row + 1
+    keys = columns[cfg.issue_key_col] if cfg.issue_key_col is not None else [''] * size
+    epics = columns[cfg.epic_col] if cfg.epic_col is not None else [''] * size
+    # every epic a target links to is reconciled, even when no row is left in it
+    summaries = {cfg.jira_epic_key: set()}
+    issue_keys = set()
+    for name, key, epic_key in zip(columns[cfg.item_col], keys, epics):
+        if not name.strip():
+            continue
+        summaries.setdefault(epic_key.strip().upper() or cfg.jira_epic_key, set()).add(issue_summary(name.strip()))
+        if key.strip():
+            issue_keys.add(key.strip())
+    if not any(summaries.values()):
+        # an empty or misconfigured DATA_RANGE would make every ticket an orphan
+        raise SystemExit(f'no item names in DATA_RANGE of {cfg.sheet_name}, nothing was transitioned')
+    return summaries, issue_keys
+
+def reconcile(targets, dry_run=False, clients=None):
+    """
+    Move the tickets of the epics whose row is gone from the sheet through RECONCILE_TRANSITION
+    Only tickets of JIRA_TICKET_TYPE with this script's summary are considered. A ticket is kept when its key
+    is in ISSUE_KEY_COLUMN or its summary matches a row's item name, in any of the targets sharing its epic.
+    The epic children are streamed page by page and orphans go out in bulk transitions of up to 1000
+    """
+    cfg = targets[0][1]
+    clients = clients or Clients(cfg)
+    epics = {}
+    issue_keys = set()
+    for _, target_cfg in targets:
+        summaries, target_keys = reconcile_keep(target_cfg, clients)
+        issue_keys |= target_keys
+        for epic_key, epic_summaries in summaries.items():
+            # the first target linking to an epic picks its transition
+            epic = epics.setdefault(epic_key, {'cfg': target_cfg, 'types': set(), 'summaries': set()})
+            epic['types'].add(target_cfg.jira_ticket_type)
+            epic['summaries'] |= epic_summaries
+
+    auth_jira = clients.async_jira() or clients.jira()
+    if isinstance(auth_jira, AsyncJira):
+        errors = JiraHTTPError
+    else:
+        from jira.exceptions import JIRAError as errors
+    pending = {}
+    counts = {'children': 0, 'orphans': 0, 'transitioned': 0}
+
+    def flush(transition_id):
+        keys = pending.pop(transition_id)
+        try:
+            with stage('transition'):
+                failed = transition_issues(cfg, auth_jira, clients.jira_limiter, transition_id, keys)
+        except errors as err:
+            print(f'transition of {len(keys)} tickets failed: {err}')
+            return
+        for issue_id, messages in failed.items():
+            print(f'{issue_id}: {"; ".join(messages)}')
+        counts['transitioned'] += len(keys) - len(failed)
+
+    for epic_key, epic in sorted(epics.items()):
+        transition_name = epic['cfg'].reconcile_transition
+        for issues in epic_children(cfg, auth_jira, epic_key, epic['types']):
+            for issue in issues:
+                counts['children'] += 1
+                fields = issue['fields']
+                # summary ~ is a fuzzy text match, only this script's exact summaries count
+                if not fields['summary'].endswith(SUMMARY_SUFFIX):
+                    continue
+                if issue['key'] in issue_keys or fields['summary'] in epic['summaries']:
+                    continue
+                if fields['status']['statusCategory']['key'] == 'done':
+                    continue
+                counts['orphans'] += 1
+                transition = next((transition for transition in issue.get('transitions', [])
+                                   if transition['name'].lower() == transition_name.lower()), None)
+                if dry_run:
+                    print(f'{issue["key"]}: would move "{fields["summary"]}" through {transition_name}')
+                elif transition is None:
+                    print(f'{issue["key"]}: no {transition_name!r} transition from {fields["status"]["name"]}')
+                else:
+                    # Jira bulk operations take up to 1000 issues
+                    pending.setdefault(transition['id'], []).append(issue['key'])
+                    if len(pending[transition['id']]) >= 1000:
+                        flush(transition['id'])
+    for transition_id in list(pending):
+        flush(transition_id)
+    print(f'reconcile: {counts["children"]} tickets in {len(epics)} epics, {counts["orphans"]} orphans, '
+          f'{counts["transitioned"]} transitioned')
 
 if __name__ == '__main__':
     main()